@@ -37,6 +37,15 @@ module Jekyll
             return GoogleScholarCitationsTag::Citations[article_id]
           end
 
+          # Prefer the counts prefetched by bin/update_scholar_citations.py (_data/citations.yml)
+          papers = context.registers[:site].data.dig('citations', 'papers') || {}
+          paper = papers["#{scholar_id}:#{article_id}"] || papers[article_id]
+          if paper
+            citation_count = Helpers.number_to_human(paper['citations'].to_i, :format => '%n%u', :precision => 2, :units => { :thousand => 'K', :million => 'M', :billion => 'B' })
+            GoogleScholarCitationsTag::Citations[article_id] = citation_count
+            return "#{citation_count}"
+          end
+
           # Sleep for a random amount of time to avoid being blocked
           sleep(rand(1.5..3.5))
 
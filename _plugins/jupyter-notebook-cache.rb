@@ -0,0 +1,22 @@
+require "digest"
+
+module Jekyll
+  # Serves notebooks pre-rendered by scripts/prerender_notebooks.py from
+  # .cache/notebooks/<sha256 of the notebook>.html instead of running nbconvert
+  # for every notebook on every build. Notebooks without a cached rendering
+  # fall back to the normal jekyll-jupyter-notebook conversion.
+  module JupyterNotebookCache
+    def convert(content)
+      cached = File.join(@config["source"], ".cache", "notebooks", "#{Digest::SHA256.hexdigest(content)}.html")
+      return File.read(cached) if File.exist?(cached)
+
+      super
+    end
+  end
+end
+
+Jekyll::Hooks.register :site, :after_init do |_site|
+  if defined?(JekyllJupyterNotebook::Converter) && !(JekyllJupyterNotebook::Converter < Jekyll::JupyterNotebookCache)
+    JekyllJupyterNotebook::Converter.prepend(Jekyll::JupyterNotebookCache)
+  end
+end
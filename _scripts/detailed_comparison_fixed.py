@@ -3,13 +3,27 @@
 Generate detailed comparison report between BibTeX and Zotero RIS files.
 """
 
+import argparse
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from instrumentation import add_profile_argument, print_summary, profiling, span  # noqa: E402
+
+BIB_FILE = "/Users/sijiayang/Documents/sijiayangcamer.github.io/_bibliography/papers.bib"
+RIS_FILE = "/Users/sijiayang/Documents/yang_zotero/yang_zotero.ris"
+OUTPUT_REPORT = "/tmp/zotero_bibtex_detailed_comparison.txt"
 
 def parse_bibtex(file_path):
     """Parse BibTeX file."""
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
+    return parse_bibtex_string(content)
+
+def parse_bibtex_string(content):
+    """Parse the text of a BibTeX file (see parse_bibtex)."""
     entries = {}
     pattern = r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}'
 
@@ -198,122 +212,135 @@ def compare_entries(bib_key, bib_entry, ris_entry):
 
     return discrepancies
 
-# Main execution
-print("Parsing BibTeX file...")
-bibtex_entries = parse_bibtex('/Users/sijiayang/Documents/sijiayangcamer.github.io/_bibliography/papers.bib')
-print(f"Found {len(bibtex_entries)} BibTeX entries")
-
-print("\nParsing Zotero RIS file...")
-ris_entries = parse_ris('/Users/sijiayang/Documents/yang_zotero/yang_zotero.ris')
-print(f"Found {len(ris_entries)} Zotero entries")
-
-print("\nMatching entries...")
-matches = match_entries(bibtex_entries, ris_entries)
-print(f"Matched {len(matches)} entries")
-
-print("\nComparing entries...")
-all_discrepancies = {}
-
-for bib_key, bib_entry, ris_entry in matches:
-    discreps = compare_entries(bib_key, bib_entry, ris_entry)
-    if discreps:
-        all_discrepancies[bib_key] = discreps
-
-print(f"\nFound {len(all_discrepancies)} entries with discrepancies\n")
-
-# Generate report
-report = []
-report.append("="*80)
-report.append("DETAILED BIBTEX vs ZOTERO COMPARISON REPORT")
-report.append("="*80)
-report.append("")
-
-report.append(f"Total BibTeX entries: {len(bibtex_entries)}")
-report.append(f"Total Zotero entries: {len(ris_entries)}")
-report.append(f"Matched entries: {len(matches)}")
-report.append(f"Entries with discrepancies: {len(all_discrepancies)}")
-report.append("")
-
-# Group by severity
-critical = []
-high = []
-medium = []
-
-for key, discreps in sorted(all_discrepancies.items()):
-    severities = [d.get('severity', 'low') for d in discreps]
-
-    if 'critical' in severities:
-        critical.append((key, discreps))
-    elif 'high' in severities:
-        high.append((key, discreps))
-    else:
-        medium.append((key, discreps))
-
-# Write critical issues
-if critical:
-    report.append("="*80)
-    report.append(f"CRITICAL ISSUES - {len(critical)} ENTRIES")
-    report.append("(Wrong years, missing/wrong authors, etc.)")
-    report.append("="*80)
-    report.append("")
+def main(bibtex_entries=None, ris_file=RIS_FILE, output_report=OUTPUT_REPORT):
+    if bibtex_entries is None:
+        print("Parsing BibTeX file...")
+        with span('parse'):
+            bibtex_entries = parse_bibtex(BIB_FILE)
+    print(f"Found {len(bibtex_entries)} BibTeX entries")
 
-    for key, discreps in critical:
-        report.append(f"Entry: {key}")
-        report.append("-" * 40)
-        for d in discreps:
-            report.append(f"  Field: {d['field'].upper()}")
-            report.append(f"  BibTeX: {d['bibtex']}")
-            report.append(f"  Zotero: {d['zotero']}")
-            if 'bib_authors' in d:
-                report.append(f"  BibTeX authors: {d['bib_authors']}")
-                report.append(f"  Zotero authors: {d['ris_authors']}")
-            report.append("")
-        report.append("")
+    print("\nParsing Zotero RIS file...")
+    with span('parse'):
+        ris_entries = parse_ris(ris_file)
+    print(f"Found {len(ris_entries)} Zotero entries")
+
+    print("\nMatching entries...")
+    with span('match'):
+        matches = match_entries(bibtex_entries, ris_entries)
+    print(f"Matched {len(matches)} entries")
+
+    print("\nComparing entries...")
+    all_discrepancies = {}
 
-# Write high priority issues
-if high:
+    for bib_key, bib_entry, ris_entry in matches:
+        discreps = compare_entries(bib_key, bib_entry, ris_entry)
+        if discreps:
+            all_discrepancies[bib_key] = discreps
+
+    print(f"\nFound {len(all_discrepancies)} entries with discrepancies\n")
+
+    # Generate report
+    report = []
     report.append("="*80)
-    report.append(f"HIGH PRIORITY ISSUES - {len(high)} ENTRIES")
-    report.append("(Title differences)")
+    report.append("DETAILED BIBTEX vs ZOTERO COMPARISON REPORT")
     report.append("="*80)
     report.append("")
 
-    for key, discreps in high:
-        report.append(f"Entry: {key}")
-        report.append("-" * 40)
-        for d in discreps:
-            report.append(f"  Field: {d['field'].upper()}")
-            report.append(f"  BibTeX: {d['bibtex'][:150]}...")
-            report.append(f"  Zotero: {d['zotero'][:150]}...")
-            report.append("")
+    report.append(f"Total BibTeX entries: {len(bibtex_entries)}")
+    report.append(f"Total Zotero entries: {len(ris_entries)}")
+    report.append(f"Matched entries: {len(matches)}")
+    report.append(f"Entries with discrepancies: {len(all_discrepancies)}")
+    report.append("")
+
+    # Group by severity
+    critical = []
+    high = []
+    medium = []
+
+    for key, discreps in sorted(all_discrepancies.items()):
+        severities = [d.get('severity', 'low') for d in discreps]
+
+        if 'critical' in severities:
+            critical.append((key, discreps))
+        elif 'high' in severities:
+            high.append((key, discreps))
+        else:
+            medium.append((key, discreps))
+
+    # Write critical issues
+    if critical:
+        report.append("="*80)
+        report.append(f"CRITICAL ISSUES - {len(critical)} ENTRIES")
+        report.append("(Wrong years, missing/wrong authors, etc.)")
+        report.append("="*80)
         report.append("")
 
-# Write medium issues
-if medium:
-    report.append("="*80)
-    report.append(f"MEDIUM PRIORITY ISSUES - {len(medium)} ENTRIES")
-    report.append("(Missing volume/issue numbers)")
-    report.append("="*80)
-    report.append("")
+        for key, discreps in critical:
+            report.append(f"Entry: {key}")
+            report.append("-" * 40)
+            for d in discreps:
+                report.append(f"  Field: {d['field'].upper()}")
+                report.append(f"  BibTeX: {d['bibtex']}")
+                report.append(f"  Zotero: {d['zotero']}")
+                if 'bib_authors' in d:
+                    report.append(f"  BibTeX authors: {d['bib_authors']}")
+                    report.append(f"  Zotero authors: {d['ris_authors']}")
+                report.append("")
+            report.append("")
 
-    for key, discreps in medium:
-        report.append(f"Entry: {key}")
-        report.append("-" * 40)
-        for d in discreps:
-            report.append(f"  Field: {d['field'].upper()}")
-            report.append(f"  BibTeX: {d['bibtex']}")
-            report.append(f"  Zotero: {d['zotero']}")
+    # Write high priority issues
+    if high:
+        report.append("="*80)
+        report.append(f"HIGH PRIORITY ISSUES - {len(high)} ENTRIES")
+        report.append("(Title differences)")
+        report.append("="*80)
+        report.append("")
+
+        for key, discreps in high:
+            report.append(f"Entry: {key}")
+            report.append("-" * 40)
+            for d in discreps:
+                report.append(f"  Field: {d['field'].upper()}")
+                report.append(f"  BibTeX: {d['bibtex'][:150]}...")
+                report.append(f"  Zotero: {d['zotero'][:150]}...")
+                report.append("")
             report.append("")
+
+    # Write medium issues
+    if medium:
+        report.append("="*80)
+        report.append(f"MEDIUM PRIORITY ISSUES - {len(medium)} ENTRIES")
+        report.append("(Missing volume/issue numbers)")
+        report.append("="*80)
         report.append("")
 
-# Print report
-report_text = '\n'.join(report)
-print(report_text)
+        for key, discreps in medium:
+            report.append(f"Entry: {key}")
+            report.append("-" * 40)
+            for d in discreps:
+                report.append(f"  Field: {d['field'].upper()}")
+                report.append(f"  BibTeX: {d['bibtex']}")
+                report.append(f"  Zotero: {d['zotero']}")
+                report.append("")
+            report.append("")
+
+    # Print report
+    report_text = '\n'.join(report)
+    print(report_text)
+
+    # Save to file
+    with open(output_report, 'w', encoding='utf-8') as f:
+        f.write(report_text)
+
+    print("\n" + "="*80)
+    print(f"Report saved to: {output_report}")
+    print("="*80)
 
-# Save to file
-with open('/tmp/zotero_bibtex_detailed_comparison.txt', 'w', encoding='utf-8') as f:
-    f.write(report_text)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare papers.bib against a Zotero RIS export.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
 
-print("\n" + "="*80)
-print(f"Report saved to: /tmp/zotero_bibtex_detailed_comparison.txt")
-print("="*80)
+    with profiling(args.profile):
+        main()
+    print_summary()
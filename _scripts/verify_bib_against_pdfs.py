@@ -3,11 +3,17 @@
 Systematically verify BibTeX entries against PDFs.
 """
 
+import argparse
 import re
 import PyPDF2
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from instrumentation import add_profile_argument, count, print_summary, profiling, span  # noqa: E402
+from bib_index import BibIndex, default_index_path  # noqa: E402
+
 BIB_FILE = "/Users/sijiayang/Documents/sijiayangcamer.github.io/_bibliography/papers.bib"
 PDF_DIR = "/Users/sijiayang/Documents/sijiayangcamer.github.io/assets/pdf"
 OUTPUT_REPORT = "/tmp/verification_report.txt"
@@ -17,6 +23,10 @@ def parse_bib_file(bib_path):
     with open(bib_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
+    return parse_bib_string(content)
+
+def parse_bib_string(content):
+    """Parse the text of a BibTeX file (see parse_bib_file)."""
     entries = []
     entry_pattern = r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}'
 
@@ -41,6 +51,16 @@ def parse_bib_file(bib_path):
 
     return entries
 
+def load_entries_by_key(keys, bib_path=BIB_FILE):
+    """Parse only the given entries, read through the papers.bib byte-offset index."""
+    repo_root = Path(__file__).resolve().parent.parent
+    with BibIndex(Path(bib_path), default_index_path(repo_root, Path(bib_path))) as index:
+        missing = [key for key in keys if key not in index]
+        if missing:
+            print(f"Error: not in {bib_path}: {', '.join(missing)}")
+            sys.exit(1)
+        return parse_bib_string('\n'.join(index.raw(key) for key in keys))
+
 def extract_first_page_text(pdf_path, max_chars=4000):
     """Extract text from first page of PDF."""
     try:
@@ -48,16 +68,19 @@ def extract_first_page_text(pdf_path, max_chars=4000):
             reader = PyPDF2.PdfReader(f)
             if len(reader.pages) > 0:
                 text = reader.pages[0].extract_text()
+                count('pdf_pages_read')
                 return text[:max_chars]  # Limit to first 4000 chars
     except Exception as e:
         return f"ERROR: {str(e)}"
     return ""
 
-def main():
+def main(entries=None, pdf_dir=PDF_DIR, output_report=OUTPUT_REPORT):
     print("Verifying BibTeX entries against PDFs...")
     print("="*80)
 
-    entries = parse_bib_file(BIB_FILE)
+    if entries is None:
+        with span('parse'):
+            entries = parse_bib_file(BIB_FILE)
 
     report = []
     report.append("="*80)
@@ -69,7 +92,7 @@ def main():
         if 'pdf' not in entry['fields']:
             continue
 
-        pdf_file = os.path.join(PDF_DIR, entry['fields']['pdf'])
+        pdf_file = os.path.join(pdf_dir, entry['fields']['pdf'])
         if not os.path.exists(pdf_file):
             report.append(f"\n{entry['key']}: PDF FILE NOT FOUND")
             continue
@@ -77,7 +100,8 @@ def main():
         print(f"Processing {entry['key']}...")
 
         # Extract first page text
-        pdf_text = extract_first_page_text(pdf_file)
+        with span('extract'):
+            pdf_text = extract_first_page_text(pdf_file)
 
         report.append(f"\n{'='*80}")
         report.append(f"ENTRY: {entry['key']}")
@@ -95,11 +119,24 @@ def main():
         report.append("")
 
     # Write report
-    with open(OUTPUT_REPORT, 'w', encoding='utf-8') as f:
+    with open(output_report, 'w', encoding='utf-8') as f:
         f.write('\n'.join(report))
 
-    print(f"\nVerification report generated: {OUTPUT_REPORT}")
+    print(f"\nVerification report generated: {output_report}")
     print("="*80)
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Verify BibTeX entries against the first page of their PDFs.')
+    parser.add_argument('--key', action='append', dest='keys', metavar='KEY',
+                        help='only verify this entry (repeatable)')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling(args.profile):
+        if args.keys:
+            with span('parse'):
+                entries = load_entries_by_key(args.keys)
+            main(entries=entries)
+        else:
+            main()
+    print_summary()
@@ -1,15 +1,27 @@
 #!/usr/bin/env python
 
+import argparse
 import os
 import sys
 import yaml
 from datetime import datetime
-from scholarly import scholarly
-
-
-def load_scholar_user_id() -> str:
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from instrumentation import add_profile_argument, count, print_summary, profiling, span  # noqa: E402
+from scholar_bib_join import (  # noqa: E402
+    join_citations,
+    load_allowlist,
+    prune_papers,
+    update_citation_counts,
+)
+from scholar_transport import add_transport_arguments, fetch_author, make_transport  # noqa: E402
+from update_member_publications import parse_bibtex_file  # noqa: E402
+
+
+def load_scholar_user_id(config_file: str = "_data/socials.yml") -> str:
     """Load the Google Scholar user ID from the configuration file."""
-    config_file = "_data/socials.yml"
     if not os.path.exists(config_file):
         print(
             f"Configuration file {config_file} not found. Please ensure the file exists and contains your Google Scholar user ID."
@@ -34,17 +46,48 @@ def load_scholar_user_id() -> str:
 
 SCHOLAR_USER_ID: str = load_scholar_user_id()
 OUTPUT_FILE: str = "_data/citations.yml"
-
-
-def get_scholar_citations() -> None:
-    """Fetch and update Google Scholar citation data."""
-    print(f"Fetching citations for Google Scholar ID: {SCHOLAR_USER_ID}")
+BIB_FILE: str = "_bibliography/papers.bib"
+COUNTS_FILE: str = "_data/citation_counts.yml"
+ARCHIVE_FILE: str = ".cache/scholar/citations_full.yml"
+
+
+def get_scholar_citations(
+    filtered: bool = False,
+    allowlist: set = frozenset(),
+    archive_file: str = ARCHIVE_FILE,
+    transport=None,
+    site_root: Optional[str] = None,
+) -> None:
+    """
+    Fetch and update Google Scholar citation data.
+
+    With filtered=True, only papers matching a papers.bib entry (or listed in
+    the allowlist) are written to OUTPUT_FILE, as {pub_id: {citations, key}};
+    the full dump goes to archive_file instead.
+
+    `transport` (see scripts/scholar_transport.py) replaces the live scholarly
+    fetch, e.g. to replay recorded fixtures offline.
+
+    `site_root` updates another site (see scripts/batch_sites.py): the user
+    ID, papers.bib and the output files are then taken relative to site_root
+    instead of the current directory.
+    """
+    if site_root is None:
+        scholar_user_id, output_file, bib_file = SCHOLAR_USER_ID, OUTPUT_FILE, BIB_FILE
+    else:
+        scholar_user_id = load_scholar_user_id(os.path.join(site_root, "_data", "socials.yml"))
+        output_file = os.path.join(site_root, OUTPUT_FILE)
+        bib_file = os.path.join(site_root, BIB_FILE)
+        archive_file = os.path.join(site_root, archive_file)
+
+    print(f"Fetching citations for Google Scholar ID: {scholar_user_id}")
     today = datetime.now().strftime("%Y-%m-%d")
 
     # Check if the output file was already updated today
-    if os.path.exists(OUTPUT_FILE):
+    existing_data = None
+    if os.path.exists(output_file):
         try:
-            with open(OUTPUT_FILE, "r") as f:
+            with open(output_file, "r") as f:
                 existing_data = yaml.safe_load(f)
             if (
                 existing_data
@@ -57,33 +100,72 @@ def get_scholar_citations() -> None:
                     return
         except Exception as e:
             print(
-                f"Warning: Could not read existing citation data from {OUTPUT_FILE}: {e}. The file may be missing or corrupted."
+                f"Warning: Could not read existing citation data from {output_file}: {e}. The file may be missing or corrupted."
             )
 
     citation_data = {"metadata": {"last_updated": today}, "papers": {}}
 
-    scholarly.set_timeout(15)
-    scholarly.set_retries(3)
     try:
-        author = scholarly.search_author_id(SCHOLAR_USER_ID)
-        author_data = scholarly.fill(author)
+        with span("fetch"):
+            author_data = fetch_author(transport or make_transport(), scholar_user_id)
     except Exception as e:
         print(
-            f"Error fetching author data from Google Scholar for user ID '{SCHOLAR_USER_ID}': {e}. Please check your internet connection and Scholar user ID."
+            f"Error fetching author data from Google Scholar for user ID '{scholar_user_id}': {e}. Please check your internet connection and Scholar user ID."
         )
         sys.exit(1)
 
     if not author_data:
         print(
-            f"Could not fetch author data for user ID '{SCHOLAR_USER_ID}'. Please verify the Scholar user ID and try again."
+            f"Could not fetch author data for user ID '{scholar_user_id}'. Please verify the Scholar user ID and try again."
         )
         sys.exit(1)
 
     if "publications" not in author_data:
-        print(f"No publications found in author data for user ID '{SCHOLAR_USER_ID}'.")
+        print(f"No publications found in author data for user ID '{scholar_user_id}'.")
         sys.exit(1)
 
-    for pub in author_data["publications"]:
+    with span("extract"):
+        extract_citation_data(author_data["publications"], citation_data)
+
+    if filtered:
+        with span("filter"):
+            write_archive(citation_data, archive_file)
+            counts = join_citations(citation_data["papers"], parse_bibtex_file(Path(bib_file)))
+            full_count = len(citation_data["papers"])
+            citation_data["papers"] = prune_papers(citation_data["papers"], counts, allowlist)
+        print(f"Keeping {len(citation_data['papers'])} of {full_count} publications (matched to papers.bib or allowlisted)")
+
+    # Compare new data with existing data
+    if existing_data and existing_data.get("papers") == citation_data["papers"]:
+        print("No changes in citation data. Skipping file update.")
+        return
+
+    try:
+        with span("dump"), open(output_file, "w") as f:
+            yaml.dump(citation_data, f, width=1000, sort_keys=True)
+        print(f"Citation data saved to {output_file}")
+    except Exception as e:
+        print(
+            f"Error writing citation data to {output_file}: {e}. Please check file permissions and disk space."
+        )
+        sys.exit(1)
+
+
+def write_archive(citation_data: dict, archive_file: str) -> None:
+    """Write the unfiltered citation data outside _data/ so Jekyll never loads it."""
+    try:
+        os.makedirs(os.path.dirname(archive_file) or ".", exist_ok=True)
+        with open(archive_file, "w") as f:
+            yaml.dump(citation_data, f, width=1000, sort_keys=True)
+        print(f"Full citation data archived to {archive_file}")
+    except Exception as e:
+        print(f"Warning: Could not write archive {archive_file}: {e}.")
+
+
+def extract_citation_data(publications: list, citation_data: dict) -> None:
+    """Copy title, year and citation count of each publication into citation_data["papers"]."""
+    count("publications_fetched", len(publications))
+    for pub in publications:
         try:
             pub_id = pub.get("pub_id") or pub.get("author_pub_id")
             if not pub_id:
@@ -108,25 +190,40 @@ def get_scholar_citations() -> None:
                 f"Error processing publication '{pub.get('bib', {}).get('title', 'Unknown')}': {e}. This publication will be skipped."
             )
 
-    # Compare new data with existing data
-    if existing_data and existing_data.get("papers") == citation_data["papers"]:
-        print("No changes in citation data. Skipping file update.")
-        return
-
-    try:
-        with open(OUTPUT_FILE, "w") as f:
-            yaml.dump(citation_data, f, width=1000, sort_keys=True)
-        print(f"Citation data saved to {OUTPUT_FILE}")
-    except Exception as e:
-        print(
-            f"Error writing citation data to {OUTPUT_FILE}: {e}. Please check file permissions and disk space."
-        )
-        sys.exit(1)
-
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update _data/citations.yml from Google Scholar.")
+    parser.add_argument(
+        "--filtered",
+        action="store_true",
+        help="only keep publications that match papers.bib entries (or the allowlist) in citations.yml",
+    )
+    parser.add_argument("--allowlist", help="YAML list of Scholar publication ids to always keep with --filtered")
+    parser.add_argument("--archive", default=ARCHIVE_FILE, help="where --filtered writes the full dump (default: %(default)s)")
+    add_transport_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
     try:
-        get_scholar_citations()
+        with profiling(args.profile):
+            get_scholar_citations(
+                filtered=args.filtered,
+                allowlist=load_allowlist(Path(args.allowlist) if args.allowlist else None),
+                archive_file=args.archive,
+                transport=make_transport(
+                    record=args.record,
+                    replay=args.replay,
+                    stub_url=args.stub_url,
+                    latency=args.latency,
+                    failure_rate=args.failure_rate,
+                    seed=args.seed,
+                ),
+            )
+            # Link Scholar ids to papers.bib keys so the site build needs no network access
+            if os.path.exists(OUTPUT_FILE) and os.path.exists(BIB_FILE):
+                with span("join"):
+                    update_citation_counts(Path(OUTPUT_FILE), Path(BIB_FILE), Path(COUNTS_FILE))
     except Exception as e:
         print(f"Unexpected error: {e}")
         sys.exit(1)
+    print_summary()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Update several al-folio lab sites in one run
+
+This script:
+1. Takes a list of site roots (each with _bibliography/papers.bib and
+   _data/members.yml), on the command line or in a file
+2. Processes the sites in a thread pool. For each site it updates the member
+   publications (update_member_publications.py, or member_shards.py if the
+   site has _members/) and publication_stats.py, then the Google Scholar
+   citations (bin/update_scholar_citations.py) and their papers.bib join
+3. Shares between sites, since co-authored papers and co-authors overlap:
+   parsed BibTeX entries (keyed by their text), the name-variant memo of
+   update_member_publications.normalize_name, and the Scholar responses (one
+   fetch per user id)
+4. Prints a per-site summary with the time of each step, and with --report
+   writes it as JSON
+
+Usage:
+    python scripts/batch_sites.py ~/sites/lab ~/sites/alice [--workers 4] [--skip-scholar]
+    python scripts/batch_sites.py --sites-file sites.txt [--replay DIR] [--report report.json]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+from instrumentation import add_profile_argument, count, counters, print_summary, profiling
+from member_shards import update_member_shards
+from publication_stats import update_publication_stats
+from run_pipeline import REPO_ROOT, load_script
+from scholar_bib_join import join_citations, write_citation_counts
+from scholar_transport import CachingTransport, add_transport_arguments, make_transport
+from update_member_publications import (
+    normalize_name,
+    parse_bibtex_entry,
+    parse_bibtex_string,
+    update_members_file,
+)
+
+
+class SharedCaches:
+    """Parsed data and Scholar responses shared by every site of a batch run."""
+
+    def __init__(self, transport=None):
+        self.transport = CachingTransport(transport) if transport is not None else None
+        self._entries: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+    def parse_entry(self, entry_key: str, entry_content: str) -> Dict:
+        """parse_bibtex_entry, parsing each distinct entry text once."""
+        with self._lock:
+            cached = self._entries.get((entry_key, entry_content))
+        if cached is None:
+            cached = parse_bibtex_entry(entry_key, entry_content)
+            with self._lock:
+                self._entries[(entry_key, entry_content)] = cached
+        else:
+            count('bib_entry_cache_hits')
+        # Copy so one site's changes can't leak into another's publications
+        return dict(cached)
+
+    def publications(self, bib_text: str) -> List[Dict]:
+        return parse_bibtex_string(bib_text, self.parse_entry)
+
+
+def read_sites_file(path: Path) -> List[Path]:
+    """Site roots from a file: one per line, relative to the file; '#' starts a comment."""
+    sites = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            sites.append(path.parent / Path(line).expanduser())
+    return sites
+
+
+@contextmanager
+def _timed(seconds: Dict[str, float], step: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds[step] = time.perf_counter() - start
+
+
+def update_site(site_root: Path, caches: SharedCaches, scholar: Optional[ModuleType] = None,
+                filtered: bool = False) -> Dict:
+    """
+    Update one site. Returns its summary: status, counts, and the seconds
+    spent in each step (parse, members, scholar).
+    """
+    result = {'site': str(site_root), 'status': 'ok', 'seconds': {}}
+    bib_path = site_root / '_bibliography' / 'papers.bib'
+    members_path = site_root / '_data' / 'members.yml'
+    for path in (bib_path, members_path):
+        if not path.exists():
+            result.update(status='failed', error=f"{path.name} not found at {path}")
+            return result
+
+    seconds = result['seconds']
+    start = time.perf_counter()
+    try:
+        with _timed(seconds, 'parse'):
+            bib_text = bib_path.read_text(encoding='utf-8')
+            publications = caches.publications(bib_text)
+        result['publications'] = len(publications)
+
+        with _timed(seconds, 'members'):
+            shard_dir = site_root / '_members'
+            if shard_dir.exists():
+                update_member_shards(shard_dir, members_path, bib_path, publications=publications)
+                members_data = None  # re-read from the rebuilt members.yml
+            else:
+                with open(members_path, 'r', encoding='utf-8') as f:
+                    members_data = yaml.safe_load(f)
+                update_members_file(members_path, bib_path, publications=publications, members_data=members_data)
+            stats = update_publication_stats(site_root, bib_text, members_data)
+        result['lab_authors'] = len(stats['members'])
+
+        if scholar is not None:
+            with _timed(seconds, 'scholar'):
+                scholar.get_scholar_citations(filtered=filtered, transport=caches.transport,
+                                              site_root=str(site_root))
+                with open(site_root / '_data' / 'citations.yml', 'r', encoding='utf-8') as f:
+                    papers = (yaml.safe_load(f) or {}).get('papers') or {}
+                counts = join_citations(papers, publications)
+                write_citation_counts(counts, site_root / '_data' / 'citation_counts.yml')
+            result['citations_matched'] = len(counts)
+    except SystemExit:
+        # bin/update_scholar_citations.py prints its errors and exits
+        result.update(status='failed', error=f"{next(reversed(seconds))} step exited (see its output above)")
+    except Exception as e:
+        result.update(status='failed', error=f"{next(reversed(seconds), 'parse')} step: {type(e).__name__}: {e}")
+    seconds['total'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(sites: List[Path], workers: int = 4, scholar: Optional[ModuleType] = None,
+              transport=None, filtered: bool = False) -> Dict:
+    """
+    Main function: update every site and return the batch report
+    ({'sites': [...], 'workers', 'seconds', 'caches': {...}}).
+    """
+    caches = SharedCaches(transport if scholar is not None else None)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda site: update_site(site, caches, scholar, filtered), sites))
+
+    current = counters()
+    names = normalize_name.cache_info()
+    scholar_hits = current.get('scholar_cache_hits', 0)
+    return {
+        'sites': results,
+        'workers': workers,
+        'seconds': time.perf_counter() - start,
+        'caches': {
+            'bib_entries': current.get('entries_parsed', 0),
+            'bib_entries_reused': current.get('bib_entry_cache_hits', 0),
+            'name_variant_hits': names.hits,
+            'name_variant_misses': names.misses,
+            'scholar_fetches': current.get('scholar_fetches', 0) - scholar_hits,
+            'scholar_cache_hits': scholar_hits,
+        },
+    }
+
+
+def print_report(report: Dict):
+    print(f"\nBatch summary ({len(report['sites'])} sites, {report['workers']} workers, "
+          f"{report['seconds']:.2f}s):")
+    for result in report['sites']:
+        steps = ', '.join(f"{step} {seconds:.2f}s" for step, seconds in result['seconds'].items())
+        counts = f"{result.get('publications', 0)} publications, {result.get('lab_authors', 0)} lab authors"
+        if 'citations_matched' in result:
+            counts += f", {result['citations_matched']} with citations"
+        print(f"  {Path(result['site']).name:<24} {result['status']:<7} {counts}")
+        if steps:
+            print(f"  {'':<24} {'':<7} {steps}")
+        if 'error' in result:
+            print(f"  {'':<24} {'':<7} {result['error']}")
+
+    caches = report['caches']
+    print(f"Shared caches: {caches['bib_entries_reused']} of {caches['bib_entries']} BibTeX entries reused, "
+          f"{caches['name_variant_hits']} name-variant memo hits ({caches['name_variant_misses']} misses), "
+          f"{caches['scholar_fetches']} Scholar author(s) fetched ({caches['scholar_cache_hits']} reused)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Update the member publications and citations of several sites.')
+    parser.add_argument('sites', nargs='*', type=Path, help='site roots')
+    parser.add_argument('--sites-file', type=Path, help='file with one site root per line')
+    parser.add_argument('--workers', type=int, default=4, help='sites processed in parallel (default: %(default)s)')
+    parser.add_argument('--skip-scholar', action='store_true', help='only update the member publications')
+    parser.add_argument('--filtered', action='store_true',
+                        help='keep only Scholar publications that match papers.bib (see update_scholar_citations.py)')
+    parser.add_argument('--report', type=Path, help='also write the summary as JSON')
+    add_transport_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    sites = list(args.sites) + (read_sites_file(args.sites_file) if args.sites_file else [])
+    # Resolve before changing directory, dropping duplicates
+    sites = list(dict.fromkeys(site.expanduser().resolve() for site in sites))
+    if not sites:
+        parser.error('no site roots given')
+
+    scholar = transport = None
+    if not args.skip_scholar:
+        # bin/update_scholar_citations.py reads this site's socials.yml on import
+        os.chdir(REPO_ROOT)
+        scholar = load_script(REPO_ROOT / 'bin' / 'update_scholar_citations.py')
+        transport = make_transport(record=args.record, replay=args.replay, stub_url=args.stub_url,
+                                   latency=args.latency, failure_rate=args.failure_rate, seed=args.seed)
+
+    with profiling(args.profile):
+        report = run_batch(sites, args.workers, scholar, transport, args.filtered)
+    print_report(report)
+    print_summary()
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        print(f"Report saved to {args.report}")
+
+    if any(result['status'] == 'failed' for result in report['sites']):
+        exit(1)
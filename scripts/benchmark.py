@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bibliography/member scripts on synthetic data
+
+This script:
+1. Generates synthetic papers.bib, members rosters and Zotero RIS exports
+   at several sizes (default 10^2 to 10^5 entries)
+2. Times each stage (parse, member matching, RIS matching, YAML dump) and
+   records its peak memory with tracemalloc
+3. Compares the results against a stored baseline JSON and flags regressions
+
+Everything runs offline, so it can run in CI.
+
+Usage:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --sizes 100 1000 --compare scripts/benchmark_baseline.json
+    python scripts/benchmark.py --write-baseline scripts/benchmark_baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from latex_unicode import latex_to_unicode
+from update_member_publications import (
+    extract_author_names,
+    format_publication_for_yaml,
+    match_member_to_publications,
+    normalize_name,
+    parse_bibtex_file,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / '_scripts'))
+from detailed_comparison_fixed import match_entries, parse_bibtex, parse_ris  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_THRESHOLD = 1.5
+
+FIRST_NAMES = ['Sijia', 'Luhang', 'Thomas', 'Xiaohui', 'Jiaying', 'Ranran', 'Moonsun', 'Linqi',
+               'Hyerin', 'Wei', 'Lynne', 'Matt', 'Zening', 'Macau', 'Michael', 'Susan', 'Morgan',
+               'Emma', 'Daniel', 'Malia', 'Christopher', 'Lauren', 'Jessica', 'Rebekah']
+LAST_NAMES = ['Yang', 'Sun', 'Zhang', 'Cao', 'Liu', 'Mi', 'Jeon', 'Lu', 'Kwon', 'Wang', 'Cotter',
+              'Minich', 'Duan', 'Mak', 'Wagner', 'Passmore', 'Medina', 'Henning', 'Schultz',
+              'Jones', 'Cascio', 'Kriss', 'Wicke', 'Cappella', 'Chen', 'Chuang', 'Kam', 'Zhao']
+WORDS = ['health', 'communication', 'cannabis', 'warning', 'labels', 'social', 'media', 'vaccine',
+         'attention', 'memory', 'experiment', 'moral', 'appeals', 'tobacco', 'platform', 'young',
+         'adults', 'rural', 'parents', 'messages', 'effects', 'survey', 'panel', 'AI', 'generative',
+         'images', 'bias', 'identity', 'perceptions', 'eye-tracking', 'algorithmic', 'public']
+JOURNALS = ['Information, Communication \\& Society', 'Annals of Behavioral Medicine',
+            'Health Promotion Practice', 'International Journal of Advertising',
+            'Journal of Computer-Mediated Communication', 'Health Communication']
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data generators
+# ---------------------------------------------------------------------------
+
+def _person(rng: random.Random) -> tuple:
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(['', ' K.', ' H.', ' R.'])
+
+
+def _synthetic_publications(n: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    pubs = []
+    for i in range(n):
+        authors = [_person(rng) for _ in range(rng.randint(2, 8))]
+        title_words = rng.sample(WORDS, rng.randint(6, 14))
+        pubs.append({
+            'key': f"{authors[0][1].lower()}{2000 + i % 26}p{i}",
+            'title': ' '.join(title_words).capitalize(),
+            'authors': authors,
+            'journal': rng.choice(JOURNALS),
+            'year': 2000 + i % 26,
+            'volume': str(rng.randint(1, 80)),
+            'number': str(rng.randint(1, 12)),
+            'start_page': rng.randint(1, 900),
+            'doi': f"10.{1000 + i % 9000}/synthetic.{i}",
+            'abstract': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(80, 220))),
+        })
+    return pubs
+
+
+def generate_bib(n: int, seed: int = 0) -> str:
+    """Return papers.bib text with n entries shaped like the lab's real entries."""
+    chunks = []
+    for pub in _synthetic_publications(n, seed):
+        authors = ' and '.join(f"{last}, {first}{middle}" for first, last, middle in pub['authors'])
+        chunks.append(
+            f"@article{{{pub['key']},\n"
+            f"  title={{{pub['title']}}},\n"
+            f"  author={{{authors}}},\n"
+            f"  journal={{{pub['journal']}}},\n"
+            f"  volume={{{pub['volume']}}},\n"
+            f"  number={{{pub['number']}}},\n"
+            f"  year={{{pub['year']}}},\n"
+            f"  doi={{{pub['doi']}}},\n"
+            f"  abbr={{SYN}},\n"
+            f"  category={{translational}},\n"
+            f"  abstract={{{pub['abstract']}}},\n"
+            f"  pdf={{{pub['key']}.pdf}},\n"
+            f"}}\n"
+        )
+    return '\n'.join(chunks)
+
+
+def generate_ris(n: int, seed: int = 0) -> str:
+    """Return a Zotero-style RIS export describing the same works as generate_bib(n, seed)."""
+    lines = []
+    for pub in _synthetic_publications(n, seed):
+        lines.append('TY  - JOUR')
+        lines.append(f"TI  - {pub['title']}")
+        for first, last, middle in pub['authors']:
+            lines.append(f"AU  - {last}, {first}{middle}")
+        lines.append(f"PY  - {pub['year']}")
+        lines.append(f"T2  - {pub['journal'].replace(chr(92), '')}")
+        lines.append(f"VL  - {pub['volume']}")
+        lines.append(f"IS  - {pub['number']}")
+        lines.append(f"SP  - {pub['start_page']}")
+        lines.append(f"EP  - {pub['start_page'] + 15}")
+        lines.append(f"DO  - {pub['doi']}")
+        lines.append('ER  - ')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def generate_members(n: int, seed: int = 0) -> Dict:
+    """Return a members.yml-shaped dict with n members spread across categories."""
+    rng = random.Random(seed)
+    categories = ['graduate_students', 'undergraduate_students', 'alumni']
+    members = {category: [] for category in categories}
+    for i in range(n):
+        first, last, _ = _person(rng)
+        members[categories[i % 3]].append({
+            'name': f"{first} {last}",
+            'photo': '',
+            'email': f"{first.lower()}{i}@wisc.edu",
+            'research_interest': ' '.join(rng.sample(WORDS, 12)),
+            'projects': ['1_project'],
+        })
+    return members
+
+
+def roster_size(n_entries: int) -> int:
+    """Roster size used alongside a bibliography of n_entries."""
+    return max(10, n_entries // 100)
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+class Stage:
+    """A benchmarked stage: setup() builds inputs (untimed), run(inputs) is timed."""
+
+    def __init__(self, name: str, setup: Callable, run: Callable, max_size: Optional[int] = None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.max_size = max_size
+
+
+def _setup_parse(n: int, workdir: Path) -> Path:
+    bib_path = workdir / f"papers_{n}.bib"
+    if not bib_path.exists():
+        bib_path.write_text(generate_bib(n), encoding='utf-8')
+    return bib_path
+
+
+def _setup_match_members(n: int, workdir: Path) -> tuple:
+    publications = parse_bibtex_file(_setup_parse(n, workdir))
+    members = generate_members(roster_size(n))
+    names = [m['name'] for category in members.values() for m in category]
+    # Fill the name-variant memo here, so the traced run measures matching
+    # rather than the memo's own memory (the same for every repeat)
+    normalize_name.cache_clear()
+    for name in names + [author for pub in publications if 'authors' in pub
+                         for author in extract_author_names(pub['authors'])]:
+        normalize_name(name)
+    return names, publications
+
+
+def _run_match_members(inputs: tuple):
+    names, publications = inputs
+    for name in names:
+        match_member_to_publications(name, publications)
+
+
+def _setup_match_entries(n: int, workdir: Path) -> tuple:
+    bib_entries = parse_bibtex(str(_setup_parse(n, workdir)))
+    ris_path = workdir / f"export_{n}.ris"
+    if not ris_path.exists():
+        ris_path.write_text(generate_ris(n), encoding='utf-8')
+    return bib_entries, parse_ris(str(ris_path))
+
+
+def _setup_yaml_dump(n: int, workdir: Path) -> Dict:
+    publications = parse_bibtex_file(_setup_parse(n, workdir))
+    members = generate_members(roster_size(n))
+    roster = [m for category in members.values() for m in category]
+    # Spread every publication over the roster so the dump size scales with n
+    for i, pub in enumerate(publications):
+        roster[i % len(roster)].setdefault('publications', []).append(pub)
+    return members
+
+
+def _run_yaml_dump(members: Dict):
+    for category in members.values():
+        for member in category:
+            if 'publications' in member:
+                member['publications'] = [format_publication_for_yaml(p) for p in member['publications']]
+    with tempfile.TemporaryFile('w', encoding='utf-8') as f:
+        yaml.dump(members, f, default_flow_style=False, allow_unicode=True, sort_keys=False, width=120)
+
+
+def _setup_latex_to_unicode(n: int, workdir: Path) -> List[str]:
+    publications = parse_bibtex_file(_setup_parse(n, workdir))
+    return [pub[field] for pub in publications for field in ('title', 'journal', 'authors') if field in pub]
+
+
+def _run_latex_to_unicode(values: List[str]):
+    # Measure conversion itself, not memo hits from the previous repeat
+    latex_to_unicode.cache_clear()
+    for value in values:
+        latex_to_unicode(value)
+
+
+STAGES = [
+    Stage('parse_bibtex_file', _setup_parse, parse_bibtex_file),
+    # Quadratic stages are capped by default so a full run stays in minutes
+    Stage('match_member_to_publications', _setup_match_members, _run_match_members, max_size=10000),
+    Stage('match_entries', _setup_match_entries, lambda inputs: match_entries(*inputs), max_size=1000),
+    Stage('yaml_dump', _setup_yaml_dump, _run_yaml_dump),
+    Stage('latex_to_unicode', _setup_latex_to_unicode, _run_latex_to_unicode),
+]
+
+
+def measure(stage: Stage, n: int, workdir: Path, repeat: int) -> Dict:
+    """Best-of-`repeat` wall time, plus peak traced memory from one extra run."""
+    timings = []
+    for _ in range(repeat):
+        inputs = stage.setup(n, workdir)
+        start = time.perf_counter()
+        stage.run(inputs)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is measured separately because tracemalloc slows execution down
+    inputs = stage.setup(n, workdir)
+    tracemalloc.start()
+    stage.run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': round(min(timings), 6), 'peak_kb': round(peak / 1024, 1)}
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 3, stages: Optional[List[str]] = None,
+                   ignore_limits: bool = False) -> Dict:
+    """Run every stage at every size and return a results document."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for stage in STAGES:
+            if stages and stage.name not in stages:
+                continue
+            results[stage.name] = {}
+            for n in sizes:
+                if stage.max_size and n > stage.max_size and not ignore_limits:
+                    print(f"  {stage.name:<30} n={n:<7} skipped (above {stage.max_size})")
+                    continue
+                result = measure(stage, n, workdir, repeat)
+                results[stage.name][str(n)] = result
+                print(f"  {stage.name:<30} n={n:<7} {result['seconds']:>10.4f}s "
+                      f"{result['peak_kb']:>12.1f} KiB peak")
+
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'sizes': sizes,
+        'results': results,
+    }
+
+
+def compare_to_baseline(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a line per stage/size whose time or memory grew beyond threshold x baseline."""
+    regressions = []
+    for stage, by_size in current['results'].items():
+        for size, result in by_size.items():
+            base = baseline.get('results', {}).get(stage, {}).get(size)
+            if not base:
+                continue
+            for metric in ('seconds', 'peak_kb'):
+                if base[metric] and result[metric] > base[metric] * threshold:
+                    regressions.append(
+                        f"{stage} n={size} {metric}: {base[metric]} -> {result[metric]} "
+                        f"({result[metric] / base[metric]:.2f}x)"
+                    )
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the maintenance scripts on synthetic data.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage/size (best is kept)')
+    parser.add_argument('--stage', action='append', dest='stages', choices=[s.name for s in STAGES],
+                        help='only run the given stage (repeatable)')
+    parser.add_argument('--ignore-limits', action='store_true', help='also run quadratic stages at large sizes')
+    parser.add_argument('--output', type=Path, help='write results JSON here')
+    parser.add_argument('--compare', type=Path, metavar='BASELINE', help='compare against a baseline JSON')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='flag results slower/larger than threshold x baseline (default: %(default)s)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 if any regression is found')
+    parser.add_argument('--write-baseline', type=Path, metavar='BASELINE', help='store results as the new baseline')
+    args = parser.parse_args()
+
+    print(f"Benchmarking sizes {args.sizes} (best of {args.repeat})")
+    results = run_benchmarks(args.sizes, args.repeat, args.stages, args.ignore_limits)
+
+    for path in (args.output, args.write_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+                f.write('\n')
+            print(f"\nResults written to: {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regressions against {args.compare} (threshold {args.threshold}x):")
+            for line in regressions:
+                print(f"  {line}")
+            if args.fail_on_regression:
+                exit(1)
+        else:
+            print(f"\n✓ No regressions against {args.compare}")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Byte-offset index for random access into papers.bib
+
+This script:
+1. Scans papers.bib once (with the same entry pattern as parse_bibtex_file) and
+   records each entry key's byte offset and length
+2. Saves that index, with a hash of each entry and the text before it, to
+   .cache/bib/papers.bib.<path hash>.index.json (keyed by the file's resolved path)
+3. On later runs, reuses the index if papers.bib is unchanged. Otherwise it
+   compares the hashes from the start and from the end of the file and scans
+   only the entries in between, so appending or editing entries in place
+   re-scans just those entries
+4. Reads single entries through mmap, so looking up one key doesn't read or
+   parse the rest of the file
+
+Usage:
+    python scripts/bib_index.py                     # build/refresh the index, print stats
+    python scripts/bib_index.py KEY [KEY ...]       # print the raw entries
+    python scripts/bib_index.py KEY --parsed        # print them parsed
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from update_member_publications import parse_bibtex_entry
+
+INDEX_VERSION = 2
+ENTRY_PATTERN = re.compile(rb'@(\w+)\{([^,]+),\s*\n(.*?)\n\}', re.DOTALL)
+BODY_PATTERN = re.compile(r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}', re.DOTALL)
+
+
+def default_index_path(repo_root: Path, bib_path: Path) -> Path:
+    """Index file under .cache/bib, keyed by the resolved path so other .bib files get their own."""
+    path_hash = hashlib.sha1(str(bib_path.resolve()).encode('utf-8')).hexdigest()[:12]
+    return repo_root / '.cache' / 'bib' / f"{bib_path.name}.{path_hash}.index.json"
+
+
+def _digest(data, start: int, end: int) -> str:
+    return hashlib.sha1(data[start:end]).hexdigest()
+
+
+class BibIndex:
+    """
+    Entry key -> [(offset, length), ...] for one .bib file, kept in a sidecar
+    JSON file. Duplicate keys keep every occurrence, in file order.
+
+    The sidecar also keeps, per entry in file order, [key, offset, length, hash],
+    where the hash covers the text from the end of the previous entry to the
+    end of this one, plus a hash of the text after the last entry.
+
+    Use as a context manager; entries are read from an mmap of the file.
+    """
+
+    def __init__(self, bib_path: Path, index_path: Optional[Path] = None):
+        self.bib_path = bib_path
+        self.index_path = index_path
+        self.entries: Dict[str, List[Tuple[int, int]]] = {}
+        self.spans: List[List] = []
+        self.scanned_bytes = 0
+        self.status = None
+        self._file = None
+        self._map = None
+
+    def __enter__(self):
+        self.status = self.refresh()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> bytes:
+        self.close()
+        self._file = open(self.bib_path, 'rb')
+        size = self.bib_path.stat().st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        return self._map
+
+    def _load(self) -> Optional[Dict]:
+        if self.index_path is None:
+            return None
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return saved if saved.get('version') == INDEX_VERSION else None
+
+    def _unchanged_suffix(self, data, saved: Dict, kept: int, scan_start: int) -> Dict[int, int]:
+        """
+        Old entries after which the file only moved by the size difference:
+        {new end offset of entry j: j}. A re-scan that ends a match at one of
+        these offsets would find exactly the old entries after j, shifted.
+        """
+        old = saved['spans']
+        delta = len(data) - saved['size']
+        tail_start = old[-1][1] + old[-1][2] + delta
+        if tail_start < scan_start or _digest(data, tail_start, len(data)) != saved['tail_sha1']:
+            return {}
+        resume = {tail_start: len(old) - 1}
+        for j in range(len(old) - 1, kept, -1):
+            segment_start = old[j - 1][1] + old[j - 1][2] + delta
+            segment_end = old[j][1] + old[j][2] + delta
+            if segment_start < scan_start or _digest(data, segment_start, segment_end) != old[j][3]:
+                break
+            resume[segment_start] = j - 1
+        return resume
+
+    def _scan(self, data, start: int, resume: Dict[int, int], old: List[List], delta: int) -> bool:
+        """
+        Index entries from `start` until the end of the file, or until a match
+        ends where the unchanged suffix begins. Returns True in the second case.
+        """
+        segment_start = start
+        for match in ENTRY_PATTERN.finditer(data, start):
+            key = match.group(2).decode('utf-8')
+            self.spans.append([key, match.start(), match.end() - match.start(),
+                               _digest(data, segment_start, match.end())])
+            segment_start = match.end()
+            j = resume.get(segment_start)
+            if j is not None:
+                self.spans.extend([key, offset + delta, length, digest] for key, offset, length, digest in old[j + 1:])
+                self.scanned_bytes += segment_start - start
+                return True
+        self.scanned_bytes += len(data) - start
+        return False
+
+    def refresh(self) -> str:
+        """
+        Bring the index up to date with the file. Returns how: 'current',
+        'appended', 'updated' (entries edited, added or removed in place) or
+        'rebuilt'.
+        """
+        stat = self.bib_path.stat()
+        data = self._open()
+        saved = self._load()
+        old = saved['spans'] if saved else []
+
+        if saved and saved['size'] == stat.st_size and saved['mtime_ns'] == stat.st_mtime_ns:
+            self.spans = old
+            self._index_spans()
+            return 'current'
+
+        # Unchanged prefix: entries whose text, and the text before them, hash the same
+        kept = start = 0
+        while kept < len(old):
+            _, offset, length, digest = old[kept]
+            if offset + length > len(data) or _digest(data, start, offset + length) != digest:
+                break
+            start = offset + length
+            kept += 1
+
+        resume = self._unchanged_suffix(data, saved, kept, start) if kept < len(old) else {}
+        self.spans = old[:kept]
+        resumed = self._scan(data, start, resume, old, len(data) - saved['size'] if saved else 0)
+        self._index_spans()
+        last_end = self.spans[-1][1] + self.spans[-1][2] if self.spans else 0
+        tail_sha1 = saved['tail_sha1'] if resumed else _digest(data, last_end, len(data))
+        self._save(stat, tail_sha1)
+
+        if not saved:
+            return 'rebuilt'
+        if kept == len(old):
+            return 'appended' if len(self.spans) > kept else 'current'
+        return 'updated' if kept or resumed else 'rebuilt'
+
+    def _index_spans(self):
+        self.entries = {}
+        for key, offset, length, _ in self.spans:
+            self.entries.setdefault(key, []).append((offset, length))
+
+    def _save(self, stat, tail_sha1: str):
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'tail_sha1': tail_sha1,
+                'spans': self.spans,
+            }, f)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def keys(self) -> List[str]:
+        return list(self.entries)
+
+    def raw(self, key: str) -> str:
+        """The full text of the (first) entry with this key, "@type{key, ... }"."""
+        offset, length = self.entries[key][0]
+        return self._map[offset:offset + length].decode('utf-8')
+
+    def publication(self, key: str) -> Dict:
+        """The entry parsed like parse_bibtex_file does."""
+        match = BODY_PATTERN.match(self.raw(key))
+        return parse_bibtex_entry(match.group(2), match.group(3))
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Look up papers.bib entries by key through a byte-offset index.')
+    parser.add_argument('keys', nargs='*', help='entry keys to print')
+    parser.add_argument('--bib', type=Path, default=repo_root / '_bibliography' / 'papers.bib')
+    parser.add_argument('--parsed', action='store_true', help='print entries parsed instead of raw')
+    parser.add_argument('--rebuild', action='store_true', help='ignore the saved index')
+    args = parser.parse_args()
+
+    if not args.bib.exists():
+        print(f"Error: {args.bib.name} not found at {args.bib}")
+        exit(1)
+
+    index_path = default_index_path(repo_root, args.bib)
+    if args.rebuild:
+        index_path.unlink(missing_ok=True)
+
+    with BibIndex(args.bib, index_path) as index:
+        if not args.keys:
+            print(f"{len(index)} entries in {args.bib.name}, index {index.status} "
+                  f"(scanned {index.scanned_bytes} bytes) -> {index_path}")
+        missing = False
+        for key in args.keys:
+            if key not in index:
+                print(f"Error: no entry '{key}' in {args.bib.name}")
+                missing = True
+            elif args.parsed:
+                print(json.dumps(index.publication(key), indent=2, ensure_ascii=False))
+            else:
+                print(index.raw(key))
+        if missing:
+            exit(1)
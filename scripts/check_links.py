@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Check every link in papers.bib and members.yml concurrently
+
+This script:
+1. Collects URLs from papers.bib (html, url, doi, replication, ...) and from
+   members.yml (links, website, publication links), deduplicated, remembering
+   where each one is used
+2. Checks external URLs with an asyncio HTTP client: keep-alive connections
+   pooled per host, at most --per-host concurrent requests per host, HEAD first
+   with a GET fallback for servers that reject HEAD, redirects followed
+3. Checks site-relative links (/assets/pdf/...) against the files on disk
+4. Caches results in .cache/links/results.json (--ttl days for working links,
+   one day for failures) so repeated runs only re-check what is due
+
+Results are grouped as ok, blocked (401/403/429 - usually bot protection, not
+a dead link) and broken.
+
+Usage:
+    python scripts/check_links.py [--concurrency 64] [--per-host 4] [--ttl 7] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import yaml
+
+from export_bibliography import parse_fields, split_entries
+
+BIB_URL_FIELDS = ('html', 'url', 'replication', 'code', 'website', 'blog', 'slides', 'poster', 'video', 'supp')
+USER_AGENT = 'Mozilla/5.0 (compatible; lab-website-link-checker/1.0)'
+MAX_REDIRECTS = 5
+MAX_REUSED_BODY = 64 * 1024
+BLOCKED_STATUSES = {401, 403, 429, 999}
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 501}
+FAILURE_TTL_DAYS = 1
+
+
+def _add(urls: Dict[str, List[str]], url, source: str):
+    if not isinstance(url, str):
+        return
+    url = url.strip()
+    if url.startswith(('http://', 'https://', '/')):
+        urls.setdefault(url, []).append(source)
+
+
+def collect_bib_urls(content: str, urls: Dict[str, List[str]]):
+    for _, key, body, _ in split_entries(content):
+        fields = parse_fields(body)
+        for name in BIB_URL_FIELDS:
+            _add(urls, fields.get(name), f"papers.bib:{key}.{name}")
+        if fields.get('doi'):
+            _add(urls, f"https://doi.org/{fields['doi'].strip()}", f"papers.bib:{key}.doi")
+        if fields.get('pdf') and '://' not in fields['pdf']:
+            _add(urls, f"/assets/pdf/{fields['pdf'].strip()}", f"papers.bib:{key}.pdf")
+
+
+def collect_member_urls(members_data: Dict, urls: Dict[str, List[str]]):
+    for category, members in (members_data or {}).items():
+        for member in members or []:
+            name = member.get('name', '?')
+            for field in ('website',):
+                _add(urls, member.get(field), f"members.yml:{name}.{field}")
+            for label, url in (member.get('links') or {}).items():
+                _add(urls, url, f"members.yml:{name}.links.{label}")
+            for pub in member.get('publications') or []:
+                _add(urls, pub.get('html'), f"members.yml:{name}.publications")
+                if pub.get('doi'):
+                    _add(urls, f"https://doi.org/{pub['doi']}", f"members.yml:{name}.publications")
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port), and a concurrency limit per host."""
+
+    def __init__(self, per_host: int, timeout: float):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self.opened = 0
+        self.reused = 0
+
+    def limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._limits:
+            self._limits[host] = asyncio.Semaphore(self.per_host)
+        return self._limits[host]
+
+    async def acquire(self, key: Tuple[str, str, int]):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.reused += 1
+                return reader, writer, True
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self.ssl_context if scheme == 'https' else None,
+                                    server_hostname=host if scheme == 'https' else None),
+            self.timeout)
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, key, reader, writer):
+        self._idle.setdefault(key, []).append((reader, writer))
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_response(reader: asyncio.StreamReader, method: str) -> Tuple[int, Dict[str, str], bool]:
+    """Read status and headers; returns (status, headers, connection reusable)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('iso-8859-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    reusable = headers.get('connection', '').lower() != 'close'
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        return status, headers, reusable
+    length = headers.get('content-length')
+    if length is not None and length.isdigit() and int(length) <= MAX_REUSED_BODY:
+        await reader.readexactly(int(length))
+        return status, headers, reusable
+    # Chunked or large body: don't download it, just drop the connection
+    return status, headers, False
+
+
+class LinkChecker:
+    def __init__(self, concurrency: int = 64, per_host: int = 4, timeout: float = 15.0):
+        self.pool = ConnectionPool(per_host, timeout)
+        self.timeout = timeout
+        self._global = asyncio.Semaphore(concurrency)
+
+    async def request(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        request = (f"{method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode('utf-8')
+
+        async with self.pool.limit(parts.hostname):
+            for attempt in range(2):
+                reader, writer, reused = await self.pool.acquire(key)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, headers, reusable = await asyncio.wait_for(_read_response(reader, method), self.timeout)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    writer.close()
+                    # A pooled connection the server already closed: retry once on a fresh one
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if reusable:
+                    self.pool.release(key, reader, writer)
+                else:
+                    writer.close()
+                return status, headers
+        raise ConnectionError(f"could not reach {parts.netloc}")
+
+    async def _follow(self, method: str, url: str) -> Tuple[int, str]:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await self.request(method, url)
+            if status in (301, 302, 303, 307, 308) and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            return status, url
+        return status, url
+
+    async def check(self, url: str) -> Dict:
+        async with self._global:
+            start = time.perf_counter()
+            result = {'url': url}
+            try:
+                status, final_url = await self._follow('HEAD', url)
+                if status in HEAD_FALLBACK_STATUSES or status >= 500:
+                    status, final_url = await self._follow('GET', url)
+                result.update(status=status, final_url=final_url)
+            except Exception as e:
+                # Some servers drop HEAD requests outright; give GET a chance before giving up
+                try:
+                    status, final_url = await self._follow('GET', url)
+                    result.update(status=status, final_url=final_url)
+                except Exception as e2:
+                    result.update(status=None, error=f"{type(e2).__name__}: {e2 or e}")
+            result['ms'] = round((time.perf_counter() - start) * 1000)
+            return result
+
+    async def close(self):
+        await self.pool.close()
+
+
+def classify(result: Dict) -> str:
+    status = result.get('status')
+    if status is not None and 200 <= status < 400:
+        return 'ok'
+    if status in BLOCKED_STATUSES:
+        return 'blocked'
+    return 'broken'
+
+
+def load_cache(cache_path: Optional[Path]) -> Dict[str, Dict]:
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        return json.loads(cache_path.read_text(encoding='utf-8'))
+    except ValueError:
+        return {}
+
+
+def is_fresh(result: Dict, ttl_days: float, now: float) -> bool:
+    ttl = ttl_days if classify(result) == 'ok' else min(ttl_days, FAILURE_TTL_DAYS)
+    return now - result.get('checked_at', 0) < ttl * 86400
+
+
+async def check_urls(urls: Iterable[str], concurrency: int = 64, per_host: int = 4,
+                     timeout: float = 15.0) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+    """Check external URLs concurrently; returns ({url: result}, connection stats)."""
+    checker = LinkChecker(concurrency, per_host, timeout)
+    try:
+        results = await asyncio.gather(*(checker.check(url) for url in urls))
+    finally:
+        await checker.close()
+    return {r['url']: r for r in results}, {'opened': checker.pool.opened, 'reused': checker.pool.reused}
+
+
+def check_local(url: str, site_root: Path) -> Dict:
+    path = site_root / urlsplit(url).path.lstrip('/')
+    exists = path.exists()
+    return {'url': url, 'status': 200 if exists else 404, **({} if exists else {'error': f"missing {path}"})}
+
+
+def run_link_check(urls: Dict[str, List[str]], site_root: Path, cache_path: Optional[Path] = None,
+                   ttl_days: float = 7, concurrency: int = 64, per_host: int = 4,
+                   timeout: float = 15.0) -> Dict[str, Dict]:
+    """
+    Main function: check every URL (using the cache where fresh) and return
+    {url: result} with 'sources' and 'state' (ok/blocked/broken) filled in.
+    """
+    now = time.time()
+    cache = load_cache(cache_path)
+    results: Dict[str, Dict] = {}
+    due = []
+    for url in urls:
+        if url.startswith('/'):
+            results[url] = check_local(url, site_root)
+        elif url in cache and is_fresh(cache[url], ttl_days, now):
+            results[url] = cache[url]
+        else:
+            due.append(url)
+
+    hosts = {urlsplit(url).hostname for url in due}
+    print(f"{len(urls)} links: {len(urls) - len(due)} local or cached, "
+          f"checking {len(due)} on {len(hosts)} hosts")
+    start = time.perf_counter()
+    checked, stats = asyncio.run(check_urls(due, concurrency, per_host, timeout))
+    if due:
+        print(f"Checked {len(due)} links in {time.perf_counter() - start:.2f}s "
+              f"({stats['opened']} connections opened, {stats['reused']} requests on reused connections)")
+    for url, result in checked.items():
+        result['checked_at'] = now
+        results[url] = result
+        cache[url] = result
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(cache, indent=1, sort_keys=True), encoding='utf-8')
+
+    for url, result in results.items():
+        result['state'] = classify(result)
+        result['sources'] = urls[url]
+    return results
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Check the links in papers.bib and members.yml.')
+    parser.add_argument('--concurrency', type=int, default=64, help='requests in flight overall')
+    parser.add_argument('--per-host', type=int, default=4, help='requests in flight per host')
+    parser.add_argument('--timeout', type=float, default=15.0)
+    parser.add_argument('--ttl', type=float, default=7, help='days to trust a cached working link')
+    parser.add_argument('--no-cache', action='store_true', help='check everything again')
+    parser.add_argument('--json', type=Path, help='also write all results to this file')
+    parser.add_argument('--fail-on-broken', action='store_true', help='exit with status 1 if any link is broken')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    members_path = repo_root / '_data' / 'members.yml'
+    for path in (bib_path, members_path):
+        if not path.exists():
+            print(f"Error: {path.name} not found at {path}")
+            exit(1)
+
+    urls: Dict[str, List[str]] = {}
+    collect_bib_urls(bib_path.read_text(encoding='utf-8'), urls)
+    with open(members_path, 'r', encoding='utf-8') as f:
+        collect_member_urls(yaml.safe_load(f), urls)
+
+    cache_path = repo_root / '.cache' / 'links' / 'results.json'
+    if args.no_cache:
+        cache_path.unlink(missing_ok=True)
+    results = run_link_check(urls, repo_root, cache_path, args.ttl, args.concurrency, args.per_host, args.timeout)
+
+    by_state: Dict[str, List[Dict]] = {'ok': [], 'blocked': [], 'broken': []}
+    for result in results.values():
+        by_state[result['state']].append(result)
+    for state in ('broken', 'blocked'):
+        if by_state[state]:
+            print(f"\n{state.upper()} ({len(by_state[state])}):")
+        for result in sorted(by_state[state], key=lambda r: r['url']):
+            print(f"  {result.get('status') or result.get('error')}  {result['url']}")
+            for source in result['sources']:
+                print(f"      used in {source}")
+    print(f"\n{len(by_state['ok'])} ok, {len(by_state['blocked'])} blocked, {len(by_state['broken'])} broken")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+        print(f"Results saved to {args.json}")
+    if by_state['broken'] and args.fail_on_broken:
+        exit(1)
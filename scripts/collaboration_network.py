@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Precompute the lab's co-authorship network from papers.bib
+
+This script:
+1. Reads every `author` field once and maps each author to a node: lab members
+   (matched with the same name variants as update_member_publications.py,
+   memoized per distinct spelling) and the site owner by their members.yml /
+   _config.yml name, everyone else by a normalized "last, first" key
+2. Builds a sparse papers x authors incidence matrix A; A^T A is the
+   co-authorship matrix (shared papers off the diagonal, paper counts on it)
+3. Computes per-member paper, collaborator and member-collaborator counts,
+   their top co-authors, and the connected components of the network
+4. Writes _data/collaboration_network.yml (nodes, weighted links, per-member
+   statistics) for a network visualization
+
+Usage:
+    python scripts/collaboration_network.py [--top 5]
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import yaml
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from export_bibliography import parse_fields, split_entries
+from publication_stats import AuthorResolver, load_owner, load_roster
+from update_member_publications import extract_author_names
+
+HEADER = (
+    "# Generated by scripts/collaboration_network.py from papers.bib and members.yml. Do not edit.\n"
+    "# Co-authorship network: nodes, links weighted by shared papers, and per-member statistics.\n"
+)
+
+
+def collaboration_network(bib_content: str, roster: Dict[str, str], top: int = 5) -> Dict:
+    """
+    Main function: the co-authorship network of bib_content, with statistics
+    for every roster name that appears in it.
+    """
+    resolver = AuthorResolver(roster)
+    node_index: Dict[str, int] = {}
+    names: List[str] = []
+    rows, cols = [], []
+    papers = 0
+    for _, _, body, _ in split_entries(bib_content):
+        authors = parse_fields(body).get('author')
+        if not authors:
+            continue
+        for author in extract_author_names(authors):
+            node, name = resolver.resolve(author)
+            if node not in node_index:
+                node_index[node] = len(names)
+                names.append(name)
+            rows.append(papers)
+            cols.append(node_index[node])
+        papers += 1
+
+    # papers x authors incidence; duplicates (an author listed twice) collapse to 1
+    incidence = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(papers, len(names)))
+    incidence.data[:] = 1
+    coauthorship = (incidence.T @ incidence).tocsr()
+    paper_counts = coauthorship.diagonal()
+    links = sparse.triu(coauthorship, k=1).tocoo()
+    adjacency = coauthorship.copy()
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+    collaborator_counts = np.diff(adjacency.indptr)
+    component_count, components = connected_components(adjacency, directed=False)
+    component_sizes = np.bincount(components)
+    # Number components by size, largest first
+    component_rank = np.empty_like(component_sizes)
+    component_rank[np.argsort(-component_sizes, kind='stable')] = np.arange(component_count)
+
+    nodes = list(node_index)
+    is_member = np.array([node in roster for node in nodes], dtype=bool)
+    member_collaborators = np.asarray((adjacency > 0) @ is_member.astype(np.int32)).ravel()
+
+    member_stats = {}
+    for node in nodes:
+        if node not in roster:
+            continue
+        i = node_index[node]
+        start, stop = adjacency.indptr[i], adjacency.indptr[i + 1]
+        neighbours, shared = adjacency.indices[start:stop], adjacency.data[start:stop]
+        order = np.lexsort((neighbours, -shared))[:top]
+        member_stats[node] = {
+            'role': roster[node],
+            'papers': int(paper_counts[i]),
+            'collaborators': int(collaborator_counts[i]),
+            'member_collaborators': int(member_collaborators[i]),
+            'component': int(component_rank[components[i]]),
+            'top_collaborators': [{'name': names[neighbours[j]], 'shared_papers': int(shared[j])} for j in order],
+        }
+
+    return {
+        'papers': papers,
+        'components': [int(size) for size in sorted(component_sizes, reverse=True)],
+        'members': member_stats,
+        'nodes': [
+            {'id': node, 'name': names[i], 'member': bool(is_member[i]), 'papers': int(paper_counts[i]),
+             'component': int(component_rank[components[i]])}
+            for i, node in enumerate(nodes)
+        ],
+        'links': [
+            {'source': nodes[i], 'target': nodes[j], 'shared_papers': int(weight)}
+            for i, j, weight in sorted(zip(links.row, links.col, links.data))
+        ],
+    }
+
+
+def write_network(network: Dict, output_path: Path) -> bool:
+    """Write the network; returns False if the file already had this content."""
+    content = HEADER + yaml.dump(network, sort_keys=False, width=1000, allow_unicode=True)
+    if output_path.exists() and output_path.read_text(encoding='utf-8') == content:
+        return False
+    output_path.write_text(content, encoding='utf-8')
+    return True
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Precompute the co-authorship network of papers.bib.')
+    parser.add_argument('--top', type=int, default=5, help='top co-authors listed per member (default: %(default)s)')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    members_path = repo_root / '_data' / 'members.yml'
+    config_path = repo_root / '_config.yml'
+    for path in (bib_path, members_path, config_path):
+        if not path.exists():
+            print(f"Error: {path.name} not found at {path}")
+            exit(1)
+
+    with open(members_path, 'r', encoding='utf-8') as f:
+        members_data = yaml.safe_load(f)
+
+    network = collaboration_network(bib_path.read_text(encoding='utf-8'),
+                                    load_roster(members_data, load_owner(config_path)), args.top)
+    print(f"{len(network['nodes'])} authors, {len(network['links'])} co-author pairs, "
+          f"{len(network['components'])} connected component(s) across {network['papers']} papers")
+    for name, stats in network['members'].items():
+        print(f"  {name}: {stats['papers']} papers, {stats['collaborators']} collaborators "
+              f"({stats['member_collaborators']} lab members)")
+
+    output_path = repo_root / '_data' / 'collaboration_network.yml'
+    if write_network(network, output_path):
+        print(f"Network saved to {output_path}")
+    else:
+        print(f"No changes in {output_path}")
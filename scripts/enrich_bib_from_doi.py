@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Fill in missing volume, number and pages in papers.bib from DOI metadata
+
+This script:
+1. Parses papers.bib and collects entries that have a doi but are missing
+   volume, number or pages
+2. Resolves each DOI against a Crossref-compatible API, several at a time,
+   reusing one persistent connection per worker thread
+3. Caches API responses on disk so reruns within the TTL skip the network
+4. Inserts the missing fields into papers.bib as new lines, leaving the rest
+   of the file untouched
+
+Usage:
+    python scripts/enrich_bib_from_doi.py --dry-run
+    python scripts/enrich_bib_from_doi.py --mailto you@wisc.edu
+    python scripts/enrich_bib_from_doi.py --stub routes.json --dry-run   # offline
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from stub_server import StubServer, load_routes
+
+DEFAULT_API_URL = 'https://api.crossref.org'
+DEFAULT_CACHE_DIR = Path('.cache') / 'crossref'
+DEFAULT_TTL_DAYS = 30
+
+# BibTeX field -> Crossref "message" field
+FIELD_MAP = {
+    'volume': 'volume',
+    'number': 'issue',
+    'pages': 'page',
+}
+
+ENTRY_PATTERN = re.compile(r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}', re.DOTALL)
+
+
+class CrossrefClient:
+    """
+    Minimal Crossref works client with per-thread keep-alive connections
+    and an on-disk JSON cache.
+    """
+
+    def __init__(self, api_url: str = DEFAULT_API_URL, cache_dir: Path = DEFAULT_CACHE_DIR,
+                 ttl_days: float = DEFAULT_TTL_DAYS, mailto: str = '', timeout: float = 15):
+        parts = urlsplit(api_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.base_path = parts.path.rstrip('/')
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_days * 86400
+        self.timeout = timeout
+        self.user_agent = 'camer-bib-enrich/1.0'
+        if mailto:
+            self.user_agent += f' (mailto:{mailto})'
+        self._local = threading.local()
+        self.stats = {'cache_hits': 0, 'requests': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn_class = (http.client.HTTPSConnection if self.scheme == 'https'
+                          else http.client.HTTPConnection)
+            conn = conn_class(self.netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _reset_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def _cache_path(self, doi: str) -> Path:
+        digest = hashlib.sha1(doi.lower().encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _read_cache(self, doi: str) -> Optional[Dict]:
+        path = self._cache_path(doi)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - cached.get('fetched_at', 0) > self.ttl_seconds:
+            return None
+        return cached
+
+    def _write_cache(self, doi: str, record: Dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_path(doi)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        tmp_path.replace(path)
+
+    def _request(self, path: str) -> Tuple[int, bytes]:
+        headers = {'User-Agent': self.user_agent, 'Accept': 'application/json'}
+        # One retry on a fresh connection if the server dropped the kept-alive one
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                self._reset_connection()
+                if attempt == 1:
+                    raise
+        raise RuntimeError('unreachable')
+
+    def fetch_work(self, doi: str) -> Optional[Dict]:
+        """
+        Return the Crossref "message" dict for a DOI, or None if the DOI
+        could not be resolved.
+        """
+        cached = self._read_cache(doi)
+        if cached is not None:
+            self._count('cache_hits')
+            return cached.get('message')
+
+        self._count('requests')
+        try:
+            status, body = self._request(f"{self.base_path}/works/{quote(doi, safe='/')}")
+        except (http.client.HTTPException, OSError) as e:
+            self._count('errors')
+            print(f"  Warning: request for {doi} failed: {e}")
+            return None
+
+        message = None
+        if status == 200:
+            try:
+                message = json.loads(body).get('message')
+            except ValueError:
+                self._count('errors')
+                print(f"  Warning: invalid JSON returned for {doi}")
+                return None
+        elif status != 404:
+            # Don't cache rate limits and server errors
+            self._count('errors')
+            print(f"  Warning: HTTP {status} for {doi}")
+            return None
+
+        self._write_cache(doi, {'doi': doi, 'fetched_at': time.time(), 'message': message})
+        return message
+
+
+def find_entries_to_enrich(content: str) -> List[Dict]:
+    """
+    Return entries that have a doi but lack at least one of volume/number/pages.
+    Each item has: entry_key, doi, missing (list of bib field names).
+    """
+    candidates = []
+    for entry in ENTRY_PATTERN.finditer(content):
+        entry_content = entry.group(3)
+        doi_match = re.search(r'^\s*doi\s*=\s*\{(.+?)\}', entry_content, re.MULTILINE)
+        if not doi_match:
+            continue
+        missing = [
+            field for field in FIELD_MAP
+            if not re.search(rf'^\s*{field}\s*=', entry_content, re.MULTILINE)
+        ]
+        if missing:
+            candidates.append({
+                'entry_key': entry.group(2).strip(),
+                'doi': doi_match.group(1).strip(),
+                'missing': missing,
+            })
+    return candidates
+
+
+def fields_from_work(work: Dict, missing: List[str]) -> Dict[str, str]:
+    """Map the Crossref message onto the missing BibTeX fields."""
+    fields = {}
+    for bib_field in missing:
+        value = work.get(FIELD_MAP[bib_field])
+        if not value:
+            continue
+        value = str(value).strip()
+        if bib_field == 'pages':
+            value = re.sub(r'\s*[-–]+\s*', '--', value)
+        fields[bib_field] = value
+    return fields
+
+
+def apply_fields(content: str, additions: Dict[str, Dict[str, str]]) -> str:
+    """
+    Insert new fields into the matching entries of the .bib text.
+
+    New lines go after the journal (or year) line so volume/number/pages sit
+    where they do in hand-written entries. Nothing else in the file changes.
+    """
+    edits = []
+    for entry in ENTRY_PATTERN.finditer(content):
+        entry_key = entry.group(2).strip()
+        fields = additions.get(entry_key)
+        if not fields:
+            continue
+
+        body_start = entry.start(3)
+        entry_content = entry.group(3)
+
+        indent = '  '
+        indent_match = re.match(r'(\s*)\w+\s*=', entry_content)
+        if indent_match:
+            indent = indent_match.group(1)
+
+        new_lines = ''.join(f"{indent}{name}={{{value}}},\n" for name, value in fields.items())
+
+        anchor = None
+        for field in ('journal', 'booktitle', 'year'):
+            line_match = re.search(rf'^\s*{field}\s*=.*\}},[ \t]*$', entry_content, re.MULTILINE)
+            if line_match:
+                anchor = body_start + line_match.end() + 1
+                break
+
+        if anchor is not None:
+            edits.append((anchor, new_lines))
+        else:
+            # Append after the last field, adding its trailing comma if needed
+            end = entry.end(3)
+            prefix = '' if entry_content.rstrip().endswith(',') else ','
+            edits.append((end, prefix + '\n' + new_lines.rstrip('\n')))
+
+    for position, text in sorted(edits, reverse=True):
+        content = content[:position] + text + content[position:]
+    return content
+
+
+def enrich_bibliography(bib_path: Path, client: CrossrefClient, workers: int = 8,
+                        dry_run: bool = False) -> Dict[str, Dict[str, str]]:
+    """
+    Main function: resolve DOIs and write the missing fields into papers.bib.
+    Returns {entry_key: {field: value}} for every field that was (or would be) added.
+    """
+    print(f"Reading bibliography from: {bib_path}")
+    with open(bib_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    candidates = find_entries_to_enrich(content)
+    print(f"Found {len(candidates)} entries with a DOI and missing volume/number/pages")
+    if not candidates:
+        return {}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        works = list(executor.map(lambda c: client.fetch_work(c['doi']), candidates))
+    elapsed = time.perf_counter() - start
+    print(f"Resolved {len(candidates)} DOIs in {elapsed:.2f}s "
+          f"({client.stats['requests']} requests, {client.stats['cache_hits']} cache hits, "
+          f"{client.stats['errors']} errors)")
+
+    additions = {}
+    for candidate, work in zip(candidates, works):
+        if not work:
+            continue
+        fields = fields_from_work(work, candidate['missing'])
+        if fields:
+            additions[candidate['entry_key']] = fields
+            summary = ', '.join(f"{k}={v}" for k, v in fields.items())
+            print(f"  {candidate['entry_key']}: {summary}")
+
+    if not additions:
+        print("\nNo new metadata found.")
+        return additions
+
+    if dry_run:
+        print(f"\nDry run: {len(additions)} entries would be updated.")
+        return additions
+
+    with open(bib_path, 'w', encoding='utf-8') as f:
+        f.write(apply_fields(content, additions))
+    print(f"\n✓ Updated {len(additions)} entries in {bib_path}")
+    return additions
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Fill missing volume/number/pages in papers.bib from DOI metadata.')
+    parser.add_argument('--bib', type=Path, default=repo_root / '_bibliography' / 'papers.bib')
+    parser.add_argument('--api-url', default=DEFAULT_API_URL,
+                        help='Crossref-compatible API base URL (default: %(default)s)')
+    parser.add_argument('--stub', type=Path, metavar='ROUTES',
+                        help='start a local stub server from a routes file and use it instead of the API')
+    parser.add_argument('--cache-dir', type=Path, default=repo_root / DEFAULT_CACHE_DIR)
+    parser.add_argument('--ttl-days', type=float, default=DEFAULT_TTL_DAYS,
+                        help='reuse cached responses younger than this (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent requests (default: %(default)s)')
+    parser.add_argument('--mailto', default='', help="contact address for Crossref's polite pool")
+    parser.add_argument('--dry-run', action='store_true', help='report changes without writing papers.bib')
+    args = parser.parse_args()
+
+    if not args.bib.exists():
+        print(f"Error: papers.bib not found at {args.bib}")
+        exit(1)
+
+    stub = StubServer(load_routes(args.stub)).start() if args.stub else None
+    try:
+        client = CrossrefClient(
+            api_url=stub.url if stub else args.api_url,
+            cache_dir=args.cache_dir,
+            ttl_days=args.ttl_days,
+            mailto=args.mailto,
+        )
+        enrich_bibliography(args.bib, client, workers=args.workers, dry_run=args.dry_run)
+    finally:
+        if stub:
+            stub.stop()
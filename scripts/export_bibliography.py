@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Export papers.bib as cleaned per-entry BibTeX, CSL-JSON and RIS in one pass
+
+This script:
+1. Reads papers.bib once and splits it into entries
+2. Cleans each entry like _plugins/hide-custom-bibtex.rb does on the site
+   (drops the fields listed under filtered_bibtex_keywords in _config.yml and
+   strips the superscript markers from the author list), removing each field
+   up to its matching closing brace so multi-line values go entirely, and
+   checks that the cleaned entry parses back to the same key and fields
+3. Converts each entry to CSL-JSON and RIS (text through latex_unicode.py),
+   reusing the previous run's output for entries whose content hash is unchanged
+4. Writes bib/<key>.bib, papers.json (CSL-JSON) and papers.ris in parallel
+
+Usage:
+    python scripts/export_bibliography.py [--output-dir assets/bibliography/export] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+from latex_unicode import latex_to_unicode
+from update_member_publications import extract_author_names
+
+ENTRY_PATTERN = re.compile(r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}', re.DOTALL)
+FIELD_START = re.compile(r'(\w+)\s*=\s*\{')
+BRACE = re.compile(r'(?<!\\)[{}]')
+SUPERSCRIPTS = re.compile(r'[*†‡§¶‖&^]')
+
+# BibTeX entry type -> (CSL type, RIS type)
+ENTRY_TYPES = {
+    'article': ('article-journal', 'JOUR'),
+    'inproceedings': ('paper-conference', 'CPAPER'),
+    'conference': ('paper-conference', 'CPAPER'),
+    'incollection': ('chapter', 'CHAP'),
+    'inbook': ('chapter', 'CHAP'),
+    'book': ('book', 'BOOK'),
+    'phdthesis': ('thesis', 'THES'),
+    'mastersthesis': ('thesis', 'THES'),
+    'techreport': ('report', 'RPRT'),
+    'unpublished': ('manuscript', 'UNPB'),
+}
+DEFAULT_TYPES = ('document', 'GEN')
+
+# Bump when the conversion changes, so cached records are regenerated
+EXPORT_VERSION = 5
+
+
+def load_filtered_keywords(config_path: Path) -> List[str]:
+    """The filtered_bibtex_keywords list from _config.yml."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    return [str(keyword) for keyword in config.get('filtered_bibtex_keywords') or []]
+
+
+def split_entries(content: str) -> List[Tuple[str, str, str, str]]:
+    """Return (type, key, body, raw entry text) for each entry, in file order."""
+    return [(m.group(1).lower(), m.group(2).strip(), m.group(3), m.group(0))
+            for m in ENTRY_PATTERN.finditer(content)]
+
+
+def field_spans(text: str) -> Iterator[Tuple[str, re.Match, int]]:
+    """(lowercased name, FIELD_START match, index after the closing brace) for each field."""
+    position = 0
+    while True:
+        match = FIELD_START.search(text, position)
+        if not match:
+            return
+        depth, end = 1, len(text) + 1
+        # Jump from brace to brace instead of scanning long abstracts character by character
+        for brace in BRACE.finditer(text, match.end()):
+            depth += 1 if brace.group(0) == '{' else -1
+            if not depth:
+                end = brace.end()
+                break
+        yield match.group(1).lower(), match, end
+        position = end
+
+
+def parse_fields(body: str) -> Dict[str, str]:
+    """Field name -> raw value, with nested braces kept (e.g. title={The {COVID} era})."""
+    return {name: body[match.end():end - 1] for name, match, end in field_spans(body)}
+
+
+def clean_bibtex(raw: str, keywords: Collection[str]) -> str:
+    """
+    Same cleanup as the hideCustomBibtex Liquid filter, but field by field: a
+    filtered field is removed with all of its lines, up to its closing brace.
+    """
+    parts, position = [], 0
+    for name, match, end in field_spans(raw):
+        if name in keywords:
+            # From the start of the field's line through its comma and line break
+            start = match.start()
+            line_start = raw.rfind('\n', 0, start) + 1
+            if not raw[line_start:start].strip():
+                start = line_start
+            tail = re.match(r',?[ \t]*\n?', raw[end:])
+            parts.append(raw[position:start])
+            position = end + tail.end()
+        elif name == 'author':
+            parts.append(raw[position:match.end()] + SUPERSCRIPTS.sub('', raw[match.end():end]))
+            position = end
+    parts.append(raw[position:])
+    return ''.join(parts)
+
+
+def check_cleaned(key: str, fields: Dict[str, str], cleaned: str, keywords: Collection[str]) -> Optional[str]:
+    """None if the cleaned entry parses back to `key` and the unfiltered fields, else the problem."""
+    entries = split_entries(cleaned)
+    if len(entries) != 1 or entries[0][1] != key:
+        return f"does not parse back to one entry with key {key}"
+    expected = {name: SUPERSCRIPTS.sub('', value) if name == 'author' else value
+                for name, value in fields.items() if name not in keywords}
+    parsed = parse_fields(entries[0][2])
+    if parsed != expected:
+        changed = sorted(set(parsed.items()) ^ set(expected.items()))
+        return f"fields differ after cleaning: {', '.join(sorted({name for name, _ in changed}))}"
+    return None
+
+
+def plain_text(value: str) -> str:
+    """Field value for CSL/RIS: LaTeX converted to Unicode, line breaks collapsed."""
+    return re.sub(r'\s+', ' ', latex_to_unicode(value)).strip()
+
+
+def split_name(author: str) -> Dict[str, str]:
+    """'Mak, Macau K. F.' or 'Macau K. F. Mak' -> {'family': 'Mak', 'given': 'Macau K. F.'}"""
+    author = SUPERSCRIPTS.sub('', plain_text(author)).strip()
+    if ',' in author:
+        family, given = (part.strip() for part in author.split(',', 1))
+    elif ' ' in author:
+        given, family = author.rsplit(' ', 1)
+    else:
+        return {'literal': author}
+    return {'family': family, 'given': given}
+
+
+def _page_range(pages: str) -> Tuple[str, str]:
+    parts = re.split(r'\s*-+\s*|\s*–\s*', plain_text(pages), maxsplit=1)
+    return parts[0], parts[1] if len(parts) > 1 else ''
+
+
+def to_csl(entry_type: str, key: str, fields: Dict[str, str]) -> Dict:
+    csl = {'id': key, 'type': ENTRY_TYPES.get(entry_type, DEFAULT_TYPES)[0]}
+    if 'title' in fields:
+        csl['title'] = plain_text(fields['title'])
+    for bib_name, csl_name in (('author', 'author'), ('editor', 'editor')):
+        if bib_name in fields:
+            csl[csl_name] = [split_name(name) for name in extract_author_names(fields[bib_name])]
+    container = fields.get('journal') or fields.get('booktitle')
+    if container:
+        csl['container-title'] = plain_text(container)
+    year = re.search(r'\d{4}', fields.get('year', ''))
+    if year:
+        csl['issued'] = {'date-parts': [[int(year.group(0))]]}
+    for bib_name, csl_name in (('volume', 'volume'), ('number', 'issue'), ('publisher', 'publisher'),
+                               ('address', 'publisher-place'), ('doi', 'DOI'), ('abstract', 'abstract'),
+                               ('note', 'note')):
+        if bib_name in fields:
+            csl[csl_name] = plain_text(fields[bib_name])
+    if 'pages' in fields:
+        start, end = _page_range(fields['pages'])
+        csl['page'] = f"{start}-{end}" if end else start
+    url = fields.get('url') or fields.get('html')
+    if url:
+        csl['URL'] = url.strip()
+    return csl
+
+
+def to_ris(entry_type: str, key: str, fields: Dict[str, str]) -> str:
+    lines = [f"TY  - {ENTRY_TYPES.get(entry_type, DEFAULT_TYPES)[1]}", f"ID  - {key}"]
+
+    def add(tag: str, value: str):
+        if value:
+            lines.append(f"{tag}  - {value}")
+
+    for name in extract_author_names(fields.get('author', '')) if 'author' in fields else ():
+        parts = split_name(name)
+        add('AU', f"{parts['family']}, {parts['given']}" if 'family' in parts else parts['literal'])
+    for name in extract_author_names(fields.get('editor', '')) if 'editor' in fields else ():
+        parts = split_name(name)
+        add('ED', f"{parts['family']}, {parts['given']}" if 'family' in parts else parts['literal'])
+    add('TI', plain_text(fields.get('title', '')))
+    if 'journal' in fields:
+        add('JO', plain_text(fields['journal']))
+    elif 'booktitle' in fields:
+        add('T2', plain_text(fields['booktitle']))
+    year = re.search(r'\d{4}', fields.get('year', ''))
+    add('PY', year.group(0) if year else '')
+    add('VL', plain_text(fields.get('volume', '')))
+    add('IS', plain_text(fields.get('number', '')))
+    if 'pages' in fields:
+        start, end = _page_range(fields['pages'])
+        add('SP', start)
+        add('EP', end)
+    add('PB', plain_text(fields.get('publisher', '')))
+    add('CY', plain_text(fields.get('address', '')))
+    add('DO', fields.get('doi', '').strip())
+    add('UR', (fields.get('url') or fields.get('html') or '').strip())
+    add('AB', plain_text(fields.get('abstract', '')))
+    add('N1', plain_text(fields.get('note', '')))
+    lines.append('ER  - ')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+    return True
+
+
+def export_bibliography(bib_path: Path, output_dir: Path, keywords: List[str],
+                        cache_path: Optional[Path] = None, force: bool = False,
+                        workers: Optional[int] = None) -> Dict:
+    """
+    Main function: write the three exports for bib_path into output_dir.
+    Returns counts of entries, converted entries and files written, and the
+    keys whose cleaned BibTeX did not parse back (not written).
+    """
+    content = bib_path.read_text(encoding='utf-8')
+    filtered = set(keywords)
+    settings = hashlib.sha1(json.dumps([EXPORT_VERSION, keywords]).encode('utf-8')).hexdigest()
+
+    cache: Dict[str, Dict] = {}
+    if cache_path is not None and cache_path.exists() and not force:
+        try:
+            cache = json.loads(cache_path.read_text(encoding='utf-8'))
+        except ValueError:
+            cache = {}
+
+    records: Dict[str, Dict] = {}
+    invalid: List[str] = []
+    converted = 0
+    for entry_type, key, body, raw in split_entries(content):
+        if key in records:
+            print(f"  Warning: duplicate key {key}, keeping the first entry")
+            continue
+        digest = hashlib.sha1(f"{settings}\0{raw}".encode('utf-8')).hexdigest()
+        cached = cache.get(key)
+        if cached and cached.get('hash') == digest:
+            records[key] = cached
+            continue
+        fields = parse_fields(body)
+        cleaned = clean_bibtex(raw, filtered).rstrip('\n') + '\n'
+        problem = check_cleaned(key, fields, cleaned, filtered)
+        if problem:
+            print(f"  Error: cleaned BibTeX for {key} {problem}")
+            invalid.append(key)
+            continue
+        records[key] = {
+            'hash': digest,
+            'bib': cleaned,
+            'csl': to_csl(entry_type, key, fields),
+            'ris': to_ris(entry_type, key, fields),
+        }
+        converted += 1
+
+    bib_dir = output_dir / 'bib'
+
+    def write_bib_files() -> int:
+        written = sum(_write_if_changed(bib_dir / f"{key}.bib", record['bib']) for key, record in records.items())
+        for stale in bib_dir.glob('*.bib'):
+            if stale.stem not in records:
+                stale.unlink()
+        return written
+
+    def write_csl() -> int:
+        csl = json.dumps([record['csl'] for record in records.values()], indent=2, ensure_ascii=False)
+        return int(_write_if_changed(output_dir / 'papers.json', csl + '\n'))
+
+    def write_ris() -> int:
+        return int(_write_if_changed(output_dir / 'papers.ris', '\n'.join(r['ris'] for r in records.values())))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(write) for write in (write_bib_files, write_csl, write_ris)]
+        written = sum(future.result() for future in futures)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(records, ensure_ascii=False), encoding='utf-8')
+
+    return {'entries': len(records), 'converted': converted, 'written': written, 'invalid': invalid}
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Export papers.bib as cleaned per-entry BibTeX, CSL-JSON and RIS.')
+    parser.add_argument('--output-dir', type=Path, default=repo_root / 'assets' / 'bibliography' / 'export')
+    parser.add_argument('--force', action='store_true', help='convert every entry, ignoring the cache')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    config_path = repo_root / '_config.yml'
+    for path in (bib_path, config_path):
+        if not path.exists():
+            print(f"Error: {path.name} not found at {path}")
+            exit(1)
+
+    stats = export_bibliography(bib_path, args.output_dir, load_filtered_keywords(config_path),
+                                cache_path=repo_root / '.cache' / 'export' / 'entries.json', force=args.force)
+    print(f"Exported {stats['entries']} entries to {args.output_dir} "
+          f"({stats['converted']} converted, {stats['written']} files written)")
+    if stats['invalid']:
+        print(f"Error: {len(stats['invalid'])} entries could not be exported: {', '.join(stats['invalid'])}")
+        exit(1)
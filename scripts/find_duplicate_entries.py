@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate entries in papers.bib (preprint vs. journal version, the same
+paper under two keys, ...)
+
+This script:
+1. Turns each entry into a set of shingles: character 4-grams of the normalized
+   title plus the authors' surnames
+2. Computes a (one-permutation) MinHash signature per entry and buckets them with
+   locality-sensitive hashing, so only entries that share a bucket are compared
+   (near-linear instead of comparing every pair)
+3. Scores each candidate pair by the exact Jaccard similarity of title shingles
+   and of author surnames, and groups pairs above --threshold into clusters
+4. Suggests a canonical key per cluster (a journal article with a DOI first,
+   then the most recent, then the most complete entry)
+
+Usage:
+    python scripts/find_duplicate_entries.py [--threshold 0.6] [--json duplicates.json]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from export_bibliography import parse_fields, split_entries
+from scholar_bib_join import normalize_title
+from update_member_publications import extract_author_names
+
+SHINGLE_SIZE = 4
+NUM_BINS = 64
+# 32 bands x 2 rows: a pair with Jaccard J becomes a candidate with probability
+# 1 - (1 - J^2)^32, i.e. ~0.9999 at 0.5 and ~1.0 at the default threshold of 0.6,
+# but only ~0.27 at 0.1, so most unrelated entries are still never compared
+BANDS = 32
+TITLE_WEIGHT = 0.7
+
+PREPRINT_MARKERS = re.compile(r'arxiv|psyarxiv|socarxiv|osf preprints|ssrn|biorxiv|medrxiv|preprint', re.IGNORECASE)
+
+
+def surname(author: str) -> str:
+    author = normalize_title(author.split(',', 1)[0] if ',' in author else (author.split() or [''])[-1])
+    return author.replace(' ', '')
+
+
+def title_shingles(title: str) -> FrozenSet[str]:
+    text = normalize_title(title)
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def author_tokens(authors: str) -> FrozenSet[str]:
+    return frozenset(filter(None, (surname(a) for a in extract_author_names(authors)))) if authors else frozenset()
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash(tokens: Set[str]) -> Tuple[int, ...]:
+    """
+    One-permutation MinHash: hash every token once, split the hash range into
+    NUM_BINS bins and keep the minimum per bin. Two signatures agree on a bin
+    with probability ~ the Jaccard similarity of the token sets, at the cost of
+    one hash per token instead of one per token and permutation.
+    """
+    bins: List[Optional[int]] = [None] * NUM_BINS
+    for token in tokens:
+        value = _hash64(token)
+        index, rest = value % NUM_BINS, value // NUM_BINS
+        if bins[index] is None or rest < bins[index]:
+            bins[index] = rest
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    if not filled:
+        return tuple([0] * NUM_BINS)
+    # Densify: an empty bin borrows the value of the next filled bin (wrapping
+    # around), offset by the distance so borrowed values stay distinguishable
+    signature = list(bins)
+    for i in range(NUM_BINS):
+        if signature[i] is None:
+            distance = next(d for d in range(1, NUM_BINS + 1) if bins[(i + d) % NUM_BINS] is not None)
+            signature[i] = bins[(i + distance) % NUM_BINS] + distance * (1 << 58)
+    return tuple(signature)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Entry:
+    def __init__(self, entry_type: str, key: str, body: str):
+        self.type = entry_type
+        self.key = key
+        # parse_fields keeps nested braces, e.g. title={... {Twitter}? ...}
+        self.fields = parse_fields(body)
+        year = re.search(r'\d{4}', self.fields.get('year', ''))
+        self.year = int(year.group(0)) if year else 0
+        self.title = title_shingles(self.fields.get('title', ''))
+        self.authors = author_tokens(self.fields.get('author', ''))
+        # Tag author tokens so they never collide with title shingles
+        self.signature = minhash(set(self.title) | {f"@{name}" for name in self.authors})
+
+    def is_preprint(self) -> bool:
+        venue = self.fields.get('journal') or self.fields.get('booktitle') or self.fields.get('howpublished', '')
+        return self.type in ('misc', 'unpublished') or bool(PREPRINT_MARKERS.search(venue))
+
+
+def candidate_pairs(entries: List[Entry], bands: int = BANDS) -> Set[Tuple[int, int]]:
+    """LSH: pairs of entry indices whose signatures agree on at least one band."""
+    rows = NUM_BINS // bands
+    pairs = set()
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for i, entry in enumerate(entries):
+            buckets.setdefault(entry.signature[band * rows:(band + 1) * rows], []).append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+
+def similarity(a: Entry, b: Entry) -> float:
+    """Weighted exact Jaccard of title shingles and author surnames."""
+    if not a.authors or not b.authors:
+        return jaccard(a.title, b.title)
+    return TITLE_WEIGHT * jaccard(a.title, b.title) + (1 - TITLE_WEIGHT) * jaccard(a.authors, b.authors)
+
+
+def canonical_key(cluster: List[Entry]) -> str:
+    def rank(entry: Entry):
+        return (
+            not entry.is_preprint(),
+            entry.type == 'article',
+            'doi' in entry.fields,
+            entry.year,
+            len(entry.fields),
+        )
+    return max(cluster, key=rank).key
+
+
+def find_duplicates(content: str, threshold: float = 0.6) -> List[Dict]:
+    """
+    Main function: cluster near-duplicate entries of a BibTeX file.
+    Returns [{'keys': [...], 'canonical': key, 'pairs': [{'a', 'b', 'similarity'}]}].
+    """
+    entries = [Entry(entry_type, key, body) for entry_type, key, body, _ in split_entries(content)]
+
+    parent = list(range(len(entries)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    scored = []
+    for i, j in sorted(candidate_pairs(entries)):
+        score = similarity(entries[i], entries[j])
+        if score >= threshold:
+            scored.append((i, j, score))
+            parent[find(i)] = find(j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i, j, _ in scored:
+        for index in (i, j):
+            members = clusters.setdefault(find(index), [])
+            if index not in members:
+                members.append(index)
+
+    result = []
+    for members in clusters.values():
+        members.sort()
+        cluster = [entries[i] for i in members]
+        pairs = [{'a': entries[i].key, 'b': entries[j].key, 'similarity': round(score, 3)}
+                 for i, j, score in scored if find(i) == find(members[0])]
+        result.append({'keys': [e.key for e in cluster], 'canonical': canonical_key(cluster), 'pairs': pairs})
+    result.sort(key=lambda c: -max(p['similarity'] for p in c['pairs']))
+    return result
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Find near-duplicate entries in papers.bib with MinHash/LSH.')
+    parser.add_argument('--bib', type=Path, default=repo_root / '_bibliography' / 'papers.bib')
+    parser.add_argument('--threshold', type=float, default=0.6,
+                        help='minimum similarity (0-1) to report a pair (default: %(default)s)')
+    parser.add_argument('--json', type=Path, help='also write the clusters to this file')
+    parser.add_argument('--fail-on-duplicates', action='store_true', help='exit with status 1 if any are found')
+    args = parser.parse_args()
+
+    if not args.bib.exists():
+        print(f"Error: {args.bib.name} not found at {args.bib}")
+        exit(1)
+
+    clusters = find_duplicates(args.bib.read_text(encoding='utf-8'), args.threshold)
+    if not clusters:
+        print(f"No near-duplicate entries in {args.bib.name} (threshold {args.threshold})")
+    for cluster in clusters:
+        print(f"\nPossible duplicates (keep {cluster['canonical']}):")
+        for pair in cluster['pairs']:
+            print(f"  {pair['a']} ~ {pair['b']}: {pair['similarity']:.2f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(clusters, indent=2) + '\n', encoding='utf-8')
+        print(f"\nClusters saved to {args.json}")
+
+    if clusters and args.fail_on_duplicates:
+        exit(1)
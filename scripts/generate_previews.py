@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Generate publication preview images from the first page of each paper's PDF
+
+This script:
+1. Finds papers.bib entries that have a `pdf` but no `preview`
+2. Renders page 1 of each PDF offline with PyMuPDF, cropped to a square around
+   the top of the page's text (title, authors, abstract) and scaled to the
+   size of the existing previews (1024x1024 PNG), in a process pool
+3. Names each image like the hand-made ones (<surname>_<year>_<first title
+   word>.png) in assets/img/publication_preview
+4. Records the PDF hash per entry in .cache/previews/manifest.json and only
+   re-renders a generated preview when its PDF changes
+5. With --update-bib, adds the `preview={...}` field to the entries with a
+   generated preview (from this or an earlier run) that don't have one yet
+
+Previews that were not generated by this script are never overwritten.
+
+Usage:
+    python scripts/generate_previews.py [--update-bib] [--workers 4] [--size 1024]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from export_bibliography import ENTRY_PATTERN, parse_fields, split_entries
+from find_duplicate_entries import surname
+from scholar_bib_join import normalize_title
+from update_member_publications import extract_author_names
+
+PREVIEW_SIZE = 1024
+MARGIN = 12  # points of white space kept around the text
+TITLE_STOPWORDS = {'a', 'an', 'the', 'to', 'of', 'on', 'in', 'for', 'and', 'or', 'with', 'how', 'what',
+                   'why', 'when', 'does', 'do', 'is', 'are', 'can', 'from', 'by', 'at', 'as', 'not'}
+
+
+def preview_name(fields: Dict[str, str]) -> str:
+    """mak_2025_quit.png for Mak et al. (2025), 'To quit or not to quit Twitter? ...'"""
+    authors = extract_author_names(fields.get('author', ''))
+    first_author = surname(authors[0]) if authors else 'anonymous'
+    year = re.search(r'\d{4}', fields.get('year', ''))
+    words = [w for w in normalize_title(fields.get('title', '')).split() if w not in TITLE_STOPWORDS]
+    parts = [first_author, year.group(0) if year else 'nd'] + words[:1]
+    return '_'.join(parts) + '.png'
+
+
+def render_preview(pdf_path: Path, image_path: Path, size: int = PREVIEW_SIZE) -> Dict:
+    """Render the top of page 1 as a size x size PNG. Runs in a worker process."""
+    import pymupdf
+
+    with pymupdf.open(pdf_path) as doc:
+        page = doc.load_page(0)
+        bounds = page.rect
+        # Bounding boxes of the non-empty text blocks on the page
+        blocks = [pymupdf.Rect(block[:4]) for block in page.get_text('blocks') if block[4].strip()]
+        if blocks:
+            content = blocks[0]
+            for block in blocks[1:]:
+                content |= block
+            left = max(bounds.x0, content.x0 - MARGIN)
+            top = max(bounds.y0, content.y0 - MARGIN)
+            side = min(content.x1 + MARGIN, bounds.x1) - left
+        else:
+            left, top, side = bounds.x0, bounds.y0, bounds.width
+        side = min(side, bounds.height - (top - bounds.y0))
+        zoom = size / side
+        # Align the clip to whole output pixels, or rounding adds a pixel row/column
+        left, top = math.floor(left * zoom) / zoom, math.floor(top * zoom) / zoom
+        clip = pymupdf.Rect(left, top, left + side, top + side)
+        pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), clip=clip, alpha=False)
+
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    pixmap.save(str(image_path))
+    return {'width': pixmap.width, 'height': pixmap.height}
+
+
+def _render(job) -> Dict:
+    pdf_path, image_path, size = job
+    try:
+        return render_preview(pdf_path, image_path, size)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+
+def add_preview_fields(content: str, previews: Dict[str, str]) -> str:
+    """Insert preview={name} before the pdf field of each entry in previews."""
+    def replace(match: re.Match) -> str:
+        key = match.group(2).strip()
+        if key not in previews or 'preview' in parse_fields(match.group(3)):
+            return match.group(0)
+        body = re.sub(r'^(\s*)pdf\s*=', lambda m: f"{m.group(1)}preview={{{previews[key]}}},\n{m.group(0)}",
+                      match.group(3), count=1, flags=re.MULTILINE)
+        return match.group(0).replace(match.group(3), body, 1)
+
+    return ENTRY_PATTERN.sub(replace, content)
+
+
+def missing_preview_fields(bib_content: str, manifest: Dict[str, Dict], preview_dir: Path) -> Dict[str, str]:
+    """{entry key: image} for generated previews that exist but are not yet in papers.bib."""
+    missing = {}
+    for _, key, body, _ in split_entries(bib_content):
+        record = manifest.get(key)
+        if record and 'preview' not in parse_fields(body) and (preview_dir / record['image']).exists():
+            missing[key] = record['image']
+    return missing
+
+
+def load_manifest(manifest_path: Optional[Path]) -> Dict[str, Dict]:
+    if manifest_path is None or not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    except ValueError:
+        return {}
+
+
+def generate_previews(bib_content: str, pdf_dir: Path, preview_dir: Path, manifest_path: Optional[Path] = None,
+                      size: int = PREVIEW_SIZE, workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Main function: render previews for entries with a pdf and no (or a
+    generated, now outdated) preview. Returns {entry key: manifest record}.
+    """
+    manifest = load_manifest(manifest_path)
+
+    jobs: List = []
+    for _, key, body, _ in split_entries(bib_content):
+        fields = parse_fields(body)
+        pdf_name = fields.get('pdf', '').strip()
+        if not pdf_name or '://' in pdf_name:
+            continue
+        generated = manifest.get(key)
+        if 'preview' in fields and (generated is None or fields['preview'].strip() != generated['image']):
+            continue  # made by hand
+        pdf_path = pdf_dir / pdf_name
+        if not pdf_path.exists():
+            print(f"  Warning: {pdf_name} for {key} not found in {pdf_dir}")
+            continue
+        if generated:
+            image = generated['image']
+        else:
+            image = preview_name(fields)
+            suffix = 2
+            while (preview_dir / image).exists() or image in (job[1] for job in jobs):
+                image = f"{preview_name(fields)[:-4]}_{suffix}.png"
+                suffix += 1
+        digest = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+        if (generated and generated['pdf_sha256'] == digest and generated.get('size') == size
+                and (preview_dir / image).exists()):
+            continue
+        jobs.append((key, image, digest, (pdf_path, preview_dir / image, size)))
+
+    results: Dict[str, Dict] = {}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for (key, image, digest, _), rendered in zip(jobs, executor.map(_render, [job[3] for job in jobs])):
+                if 'error' in rendered:
+                    print(f"  {key}: failed ({rendered['error']})")
+                    continue
+                results[key] = {'image': image, 'pdf_sha256': digest, 'size': size}
+                print(f"  {key}: {image} ({rendered['width']}x{rendered['height']})")
+
+    if manifest_path is not None and results:
+        manifest.update(results)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    return results
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description="Generate preview images from each paper's first PDF page.")
+    parser.add_argument('--update-bib', action='store_true', help='add preview={...} to the entries in papers.bib')
+    parser.add_argument('--size', type=int, default=PREVIEW_SIZE, help='preview width and height in pixels')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    if not bib_path.exists():
+        print(f"Error: papers.bib not found at {bib_path}")
+        exit(1)
+
+    content = bib_path.read_text(encoding='utf-8')
+    preview_dir = repo_root / 'assets' / 'img' / 'publication_preview'
+    manifest_path = repo_root / '.cache' / 'previews' / 'manifest.json'
+    results = generate_previews(content, repo_root / 'assets' / 'pdf', preview_dir, manifest_path,
+                                args.size, args.workers)
+    print(f"Generated {len(results)} preview(s)")
+
+    if args.update_bib:
+        # Every generated preview, including those from earlier runs without --update-bib
+        previews = missing_preview_fields(content, load_manifest(manifest_path), preview_dir)
+        updated = add_preview_fields(content, previews)
+        if updated != content:
+            bib_path.write_text(updated, encoding='utf-8')
+            print(f"Added {len(previews)} preview field(s) to {bib_path}")
@@ -0,0 +1,150 @@
+"""
+Lightweight timing, counters and profiling shared by the maintenance scripts
+
+    from instrumentation import span, count, profiling, add_profile_argument
+
+    with span('parse'):
+        publications = parse_bibtex_file(bib_path)
+    count('entries_parsed', len(publications))
+
+    print_summary()
+
+Spans record wall-clock durations per stage, counters accumulate totals such as
+entries parsed or PDF pages read. When a script is run with `--profile PREFIX`,
+`profiling()` also runs cProfile and writes:
+
+- PREFIX.pstats       cProfile stats (open with `python -m pstats` or snakeviz)
+- PREFIX.trace.json   spans as Chrome trace events (chrome://tracing, Perfetto)
+                      plus the final counter values
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+_lock = threading.Lock()
+_spans: List[Dict] = []
+_counters: Counter = Counter()
+_origin = time.perf_counter()
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[None]:
+    """Time the enclosed block and record it under `name` (attrs end up in the trace)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        record = {
+            'name': name,
+            'start': start - _origin,
+            'duration': end - start,
+            'thread': threading.get_ident(),
+            'attrs': attrs,
+        }
+        with _lock:
+            _spans.append(record)
+
+
+def count(name: str, n: int = 1):
+    """Add n to counter `name`."""
+    with _lock:
+        _counters[name] += n
+
+
+def counters() -> Dict[str, int]:
+    with _lock:
+        return dict(_counters)
+
+
+def stage_totals() -> Dict[str, Dict[str, float]]:
+    """Return {span name: {'calls': n, 'seconds': total}} in first-seen order."""
+    totals: Dict[str, Dict[str, float]] = {}
+    with _lock:
+        for record in _spans:
+            total = totals.setdefault(record['name'], {'calls': 0, 'seconds': 0.0})
+            total['calls'] += 1
+            total['seconds'] += record['duration']
+    return totals
+
+
+def reset():
+    """Forget all spans and counters (used when one process runs several jobs)."""
+    global _origin
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _origin = time.perf_counter()
+
+
+def print_summary(title: str = 'Timing summary'):
+    """Print per-stage totals and counters."""
+    totals = stage_totals()
+    current = counters()
+    if not totals and not current:
+        return
+    print(f"\n{title}:")
+    for name, total in totals.items():
+        calls = f" ({total['calls']} calls)" if total['calls'] > 1 else ''
+        print(f"  {name:<24} {total['seconds']:>9.3f}s{calls}")
+    for name, value in sorted(current.items()):
+        print(f"  {name:<24} {value:>9}")
+
+
+def write_trace(trace_path: Path):
+    """Write spans and counters as Chrome trace events."""
+    pid = os.getpid()
+    with _lock:
+        events = [
+            {
+                'name': record['name'],
+                'ph': 'X',
+                'ts': round(record['start'] * 1e6),
+                'dur': round(record['duration'] * 1e6),
+                'pid': pid,
+                'tid': record['thread'],
+                'args': record['attrs'],
+            }
+            for record in _spans
+        ]
+        current = dict(_counters)
+    with open(trace_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'counters': current}, f, indent=1, default=str)
+
+
+def add_profile_argument(parser: argparse.ArgumentParser):
+    """Add the shared --profile option to a script's argument parser."""
+    parser.add_argument(
+        '--profile', type=Path, metavar='PREFIX',
+        help='run under cProfile and write PREFIX.pstats and PREFIX.trace.json',
+    )
+
+
+@contextmanager
+def profiling(prefix: Optional[Path]) -> Iterator[None]:
+    """Profile the enclosed block if prefix is set; otherwise do nothing."""
+    if prefix is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        prefix.parent.mkdir(parents=True, exist_ok=True)
+        pstats_path = Path(f"{prefix}.pstats")
+        trace_path = Path(f"{prefix}.trace.json")
+        profiler.dump_stats(pstats_path)
+        write_trace(trace_path)
+        print(f"\nProfile written to: {pstats_path}")
+        print(f"Trace written to: {trace_path}")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Convert LaTeX-encoded BibTeX field values to plain Unicode text
+
+Handles, in a single left-to-right pass over the string:
+- accents in every common spelling: \\"u, \\"{u}, {\\"u}, \\'{\\i}, \\c c, \\v{s}, and
+  na\\"\\i ve (the space ending a control-word base such as \\i is dropped)
+- special letters and ligatures: \\ss, \\o, \\aa, \\ae, \\oe, \\l, ...
+- escaped characters: \\& \\% \\$ \\# \\_ \\{ \\} and \\~{} / \\^{}
+- dashes, ties and quotes: -- ---  ~  `` ''
+- formatting commands (\\emph{x}, \\textit{x}, ...), which keep their text
+- other commands with an argument (\\url{x}), which also keep the argument
+  text, and \\href{url}{text}, which keeps the link text; unknown commands
+  without an argument are kept as written
+- grouping braces such as brace-protected capitals ({COVID} -> COVID)
+
+Results are memoized, since journal names and author lists repeat across entries.
+
+Usage:
+    python scripts/latex_unicode.py "Caf{\\'e} in G{\\"o}ttingen -- {COVID}"
+"""
+
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+# Accent command -> combining character
+ACCENTS = {
+    "'": '\u0301',  # acute
+    '`': '\u0300',  # grave
+    '^': '\u0302',  # circumflex
+    '"': '\u0308',  # diaeresis
+    '~': '\u0303',  # tilde
+    '=': '\u0304',  # macron
+    '.': '\u0307',  # dot above
+    'u': '\u0306',  # breve
+    'v': '\u030c',  # caron
+    'H': '\u030b',  # double acute
+    'c': '\u0327',  # cedilla
+    'k': '\u0328',  # ogonek
+    'r': '\u030a',  # ring above
+    'd': '\u0323',  # dot below
+    'b': '\u0331',  # macron below
+}
+
+# Commands that stand for a character by themselves
+SYMBOLS = {
+    'ss': 'ß', 'SS': 'SS',
+    'o': 'ø', 'O': 'Ø',
+    'aa': 'å', 'AA': 'Å',
+    'ae': 'æ', 'AE': 'Æ',
+    'oe': 'œ', 'OE': 'Œ',
+    'l': 'ł', 'L': 'Ł',
+    'i': 'ı', 'j': 'ȷ',
+    'dh': 'ð', 'DH': 'Ð', 'th': 'þ', 'TH': 'Þ',
+    'ldots': '…', 'dots': '…', 'textellipsis': '…',
+    'textendash': '–', 'textemdash': '—',
+    'textquoteleft': '‘', 'textquoteright': '’',
+    'textquotedblleft': '“', 'textquotedblright': '”',
+    'guillemotleft': '«', 'guillemotright': '»',
+    'textregistered': '®', 'texttrademark': '™', 'copyright': '©',
+    'textdegree': '°', 'S': '§', 'P': '¶', 'pounds': '£', 'euro': '€',
+    'textbackslash': '\\', 'textasciitilde': '~', 'textasciicircum': '^',
+    'textbar': '|', 'textless': '<', 'textgreater': '>',
+}
+
+# Commands whose argument is kept as plain text (the braces are dropped as grouping)
+FORMATTING = {
+    'emph', 'textit', 'textbf', 'textsc', 'texttt', 'textrm', 'textsf', 'textsl', 'textup',
+    'textnormal', 'mbox', 'text', 'mathrm', 'mathit', 'mathbf', 'uppercase', 'MakeUppercase',
+    'itshape', 'bfseries', 'scshape', 'em', 'it', 'bf', 'sc', 'rm', 'tt', 'noopsort', 'protect',
+}
+
+PUNCTUATION = {
+    '---': '—',
+    '--': '–',
+    '``': '“',
+    "''": '”',
+    '~': '\u00a0',
+    '{': '',
+    '}': '',
+}
+
+_ACCENT_SYMBOLS = r"""['`^"~=.]"""
+_ACCENT_LETTERS = r'[uvHckrdb]'
+# A control-word base (\i, \j) ends at the space after it, which TeX swallows: na\"\i ve -> naïve
+_BASE = r'(?:\\[ij](?![A-Za-z])\s?|[A-Za-z])'
+
+TOKEN_PATTERN = re.compile(
+    # \~{} and \^{}: the literal character
+    r'\\(?P<literal>[~^])\{\}'
+    # \"{u}, \'{\i}, \v{s}, \c{c}
+    rf'|\\(?P<accent_braced>{_ACCENT_SYMBOLS}|{_ACCENT_LETTERS})\s*\{{\s*(?P<braced_base>{_BASE})\s*\}}'
+    # \"u, \'\i
+    rf'|\\(?P<accent_symbol>{_ACCENT_SYMBOLS})\s*(?P<symbol_base>{_BASE})'
+    # \c c, \v s (a letter accent needs whitespace before an unbraced base)
+    rf'|\\(?P<accent_letter>{_ACCENT_LETTERS})\s+(?P<letter_base>{_BASE})'
+    # \&, \%, \$, \#, \_, \{, \}, \~, \^, \\ (line break)
+    r'|\\(?P<escape>[&%$#_{}~^\\ ])'
+    # \href{url}: the URL is dropped, the link text that follows is kept
+    r'|(?P<href>\\href\s*\{[^{}]*\})(?=\s*\{)'
+    # \ss, \ldots, \emph, ... (an empty {} after a symbol command is swallowed)
+    r'|\\(?P<command>[A-Za-z]+)(?:\{\}|\s*)'
+    r'|(?P<punct>---|--|``|\'\'|~|[{}])'
+)
+
+_NEEDS_CONVERSION = re.compile(r"[\\{}~`]|--|''")
+
+
+def _compose(base: str, accent: str) -> str:
+    base = {'\\i': 'i', '\\j': 'j'}.get(base.rstrip(), base)
+    return unicodedata.normalize('NFC', base + ACCENTS[accent])
+
+
+def _replace(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind == 'literal':
+        return match.group('literal')
+    if kind == 'braced_base':
+        return _compose(match.group('braced_base'), match.group('accent_braced'))
+    if kind == 'symbol_base':
+        return _compose(match.group('symbol_base'), match.group('accent_symbol'))
+    if kind == 'letter_base':
+        return _compose(match.group('letter_base'), match.group('accent_letter'))
+    if kind == 'escape':
+        escaped = match.group('escape')
+        return ' ' if escaped in '\\ ' else escaped
+    if kind == 'href':
+        return ''
+    if kind == 'command':
+        name = match.group('command')
+        if name in SYMBOLS:
+            return SYMBOLS[name]
+        if name in FORMATTING:
+            return ''
+        # Unknown command with an argument (\url{...}): keep the argument's text,
+        # like a formatting command, rather than gluing the name onto it
+        if match.string.startswith('{', match.end()):
+            return ''
+        # Unknown command on its own: keep it as written rather than guess
+        return match.group(0)
+    return PUNCTUATION[match.group('punct')]
+
+
+@lru_cache(maxsize=8192)
+def latex_to_unicode(text: str) -> str:
+    """Convert one BibTeX field value (e.g. a title or journal name) to Unicode."""
+    if not _NEEDS_CONVERSION.search(text):
+        return text
+    return TOKEN_PATTERN.sub(_replace, text)
+
+
+if __name__ == '__main__':
+    for argument in sys.argv[1:] or [sys.stdin.read()]:
+        print(latex_to_unicode(argument))
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Keep lab members as one YAML file per member and build _data/members.yml from them
+
+Layout:
+    _members/<category>/<member-slug>.yml    e.g. _members/alumni/jane-doe.yml
+
+Each shard holds one member entry exactly as it appears in members.yml, plus an
+optional `order` number that sets the member's position within the category
+(lowest first; members without one come last, by file name). The people page
+still reads _data/members.yml, which this script generates from the shards.
+
+The shards live outside _data/ on purpose: Jekyll would load a _data/members/
+directory into the same site.data.members variable as _data/members.yml.
+
+This script:
+1. split:     writes one shard per member from the current members.yml
+2. update:    matches papers.bib publications to members (like
+              update_member_publications.py) and rewrites only the shards whose
+              publication list changed
+3. aggregate: rebuilds members.yml from the shards, re-reading only shards
+              changed since the last run
+
+Usage:
+    python scripts/member_shards.py split
+    python scripts/member_shards.py update [--member "Jane Doe"]
+    python scripts/member_shards.py aggregate
+"""
+
+import argparse
+import os
+import pickle
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from update_member_publications import (
+    MEMBER_CATEGORIES,
+    dump_members,
+    format_publication_for_yaml,
+    match_member_to_publications,
+    parse_bibtex_file,
+)
+
+ORDER_KEY = 'order'
+ORDER_STEP = 10
+SHARD_SUFFIX = '.yml'
+
+# CLoader is several times faster when PyYAML was built with libyaml
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def member_slug(name: str) -> str:
+    """'Thomas Hongjie Zhang' -> 'thomas-hongjie-zhang'"""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'member'
+
+
+def category_dirs(shard_dir: Path) -> List[Path]:
+    """Category directories, in members.yml order (unknown categories last, by name)."""
+    dirs = {path.name: path for path in shard_dir.iterdir() if path.is_dir()} if shard_dir.exists() else {}
+    known = [dirs.pop(category) for category in MEMBER_CATEGORIES if category in dirs]
+    return known + [dirs[name] for name in sorted(dirs)]
+
+
+def shard_paths(shard_dir: Path) -> List[Path]:
+    return [path for directory in category_dirs(shard_dir) for path in sorted(directory.glob(f"*{SHARD_SUFFIX}"))]
+
+
+def read_shard(path: Path) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
+
+def write_shard(path: Path, member: Dict) -> bool:
+    """Write one shard if its content changed; returns True if the file was written."""
+    content = dump_members(member)
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding='utf-8')
+    tmp_path.replace(path)
+    return True
+
+
+class ShardCache:
+    """
+    Parsed shards keyed by path, reused while the file's mtime and size are
+    unchanged, so aggregating after a one-member edit parses one file.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path
+        self.entries: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as f:
+                    self.entries = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self.entries = {}
+        self.parsed = 0
+
+    @staticmethod
+    def _signature(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self, paths: List[Path], workers: Optional[int] = None) -> Dict[Path, Dict]:
+        signatures = {path: self._signature(path) for path in paths}
+        stale = [path for path in paths
+                 if self.entries.get(str(path), (None,))[0] != signatures[path]]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, member in zip(stale, executor.map(read_shard, stale)):
+                self.entries[str(path)] = (signatures[path], member)
+        self.parsed += len(stale)
+        wanted = {str(path) for path in paths}
+        self.entries = {key: value for key, value in self.entries.items() if key in wanted}
+        return {path: self.entries[str(path)][1] for path in paths}
+
+    def remember(self, path: Path, member: Dict):
+        self.entries[str(path)] = (self._signature(path), member)
+
+    def save(self):
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump(self.entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def aggregate_members(shards: Dict[Path, Dict]) -> Dict[str, List[Dict]]:
+    """Combine shards into the members.yml structure ({category: [member, ...]})."""
+    by_category: Dict[str, List[Tuple[float, str, Dict]]] = {}
+    for path, member in shards.items():
+        order = member.get(ORDER_KEY)
+        sort_key = float(order) if isinstance(order, (int, float)) else float('inf')
+        entry = {key: value for key, value in member.items() if key != ORDER_KEY}
+        by_category.setdefault(path.parent.name, []).append((sort_key, path.name, entry))
+
+    # The standard categories are always present (possibly empty), as in members.yml
+    categories = MEMBER_CATEGORIES + sorted(c for c in by_category if c not in MEMBER_CATEGORIES)
+    return {
+        category: [entry for _, _, entry in sorted(by_category.get(category, []), key=lambda item: item[:2])]
+        for category in categories
+    }
+
+
+def write_members_if_changed(members_path: Path, members_data: Dict) -> bool:
+    content = dump_members(members_data)
+    if members_path.exists() and members_path.read_text(encoding='utf-8') == content:
+        return False
+    members_path.write_text(content, encoding='utf-8')
+    return True
+
+
+def split_members(members_data: Dict, shard_dir: Path, workers: Optional[int] = None) -> List[Path]:
+    """
+    Write one shard per member of members_data and delete shards of members that
+    are no longer in it. Returns the shards that were written.
+    """
+    targets: Dict[Path, Dict] = {}
+    for category, members in members_data.items():
+        for position, member in enumerate(members or [], start=1):
+            slug = member_slug(member.get('name', ''))
+            path = shard_dir / category / f"{slug}{SHARD_SUFFIX}"
+            suffix = 2
+            while path in targets:
+                path = shard_dir / category / f"{slug}-{suffix}{SHARD_SUFFIX}"
+                suffix += 1
+            targets[path] = {**member, ORDER_KEY: position * ORDER_STEP}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        written = [path for path, changed in zip(targets, executor.map(write_shard, targets, targets.values()))
+                   if changed]
+
+    for path in set(shard_paths(shard_dir)) - set(targets):
+        path.unlink()
+        print(f"  Removed {path}")
+    return written
+
+
+def _match_publications(member: Dict, publications: List[Dict]) -> Dict:
+    updated = dict(member)
+    matched = match_member_to_publications(member.get('name', ''), publications)
+    if matched:
+        updated['publications'] = [format_publication_for_yaml(pub) for pub in matched]
+    else:
+        updated.pop('publications', None)
+    return updated
+
+
+def update_member_shards(shard_dir: Path, members_path: Path, bib_path: Path,
+                         publications: Optional[List[Dict]] = None,
+                         names: Optional[Iterable[str]] = None,
+                         cache: Optional[ShardCache] = None,
+                         workers: Optional[int] = None) -> List[Path]:
+    """
+    Main function: refresh the publications in the member shards (all of them,
+    or only the members in `names`), then rebuild members.yml.
+    Returns the shards that changed.
+    """
+    if publications is None:
+        publications = parse_bibtex_file(bib_path)
+    cache = cache or ShardCache()
+
+    shards = cache.load(shard_paths(shard_dir), workers)
+    if names is not None:
+        # By the name stored in the shard: file names may carry a collision suffix (jane-doe-2.yml)
+        slugs = {member_slug(name) for name in names}
+        shards = {path: member for path, member in shards.items() if member_slug(member.get('name', '')) in slugs}
+
+    updates = {}
+    for path, member in shards.items():
+        updated = _match_publications(member, publications)
+        if updated != member:
+            updates[path] = updated
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(write_shard, updates, updates.values()))
+    for path, member in updates.items():
+        cache.remember(path, member)
+        print(f"  {member.get('name', path.stem)}: {len(member.get('publications', []))} publications")
+    print(f"Checked {len(shards)} members against {len(publications)} publications, "
+          f"{len(updates)} shards updated")
+
+    aggregate_shards(shard_dir, members_path, cache, workers)
+    return list(updates)
+
+
+def aggregate_shards(shard_dir: Path, members_path: Path, cache: Optional[ShardCache] = None,
+                     workers: Optional[int] = None) -> bool:
+    """Rebuild members.yml from the shards; returns True if the file changed."""
+    cache = cache or ShardCache()
+    members_data = aggregate_members(cache.load(shard_paths(shard_dir), workers))
+    cache.save()
+    total = sum(len(members) for members in members_data.values())
+    if write_members_if_changed(members_path, members_data):
+        print(f"Wrote {total} members to {members_path} (parsed {cache.parsed} shards)")
+        return True
+    print(f"No changes in {members_path} (parsed {cache.parsed} shards)")
+    return False
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Split members.yml into per-member shards and rebuild it from them.')
+    parser.add_argument('command', choices=['split', 'update', 'aggregate'])
+    parser.add_argument('--shard-dir', type=Path, default=repo_root / '_members')
+    parser.add_argument('--member', action='append', dest='members', metavar='NAME',
+                        help='with update: only refresh this member (repeatable)')
+    parser.add_argument('--workers', type=int, help='threads for reading/writing shards')
+    args = parser.parse_args()
+
+    members_path = repo_root / '_data' / 'members.yml'
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    cache = ShardCache(repo_root / '.cache' / 'members' / 'shards.pickle')
+
+    if args.command == 'split':
+        if not members_path.exists():
+            print(f"Error: members.yml not found at {members_path}")
+            exit(1)
+        with open(members_path, 'r', encoding='utf-8') as f:
+            members_data = yaml.safe_load(f) or {}
+        written = split_members(members_data, args.shard_dir, args.workers)
+        print(f"Wrote {len(written)} shards to {args.shard_dir}")
+    elif not args.shard_dir.exists():
+        print(f"Error: no member shards at {args.shard_dir} (run `split` first)")
+        exit(1)
+    elif args.command == 'update':
+        if not bib_path.exists():
+            print(f"Error: papers.bib not found at {bib_path}")
+            exit(1)
+        update_member_shards(args.shard_dir, members_path, bib_path, names=args.members,
+                             cache=cache, workers=args.workers)
+    else:
+        aggregate_shards(args.shard_dir, members_path, cache, args.workers)
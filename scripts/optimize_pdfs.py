@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Linearize and recompress the paper PDFs in assets/pdf
+
+This script:
+1. Finds every PDF referenced by a `pdf` field in papers.bib
+2. Skips files whose hash matches the last run (.cache/pdf/manifest.json)
+3. Rewrites the others in a process pool with pikepdf: linearized ("fast web
+   view", so browsers can show page 1 before the whole file has arrived),
+   streams recompressed, objects packed into object streams, unused resources
+   dropped
+4. Checks that the page count and first-page text (PyPDF2, as in
+   _scripts/verify_bib_against_pdfs.py) are unchanged before replacing the
+   original, and keeps the original if the result isn't smaller or newly
+   linearized
+5. Records the sizes before and after; files that failed are not recorded,
+   so they are tried again next run, and the script exits with status 1
+
+Usage:
+    python scripts/optimize_pdfs.py [--workers 4] [--dry-run] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from export_bibliography import parse_fields, split_entries
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / '_scripts'))
+from verify_bib_against_pdfs import extract_first_page_text  # noqa: E402
+
+
+def referenced_pdfs(bib_content: str, pdf_dir: Path) -> List[Path]:
+    """The local files named by `pdf` fields, in file order, without duplicates."""
+    paths: List[Path] = []
+    for _, _, body, _ in split_entries(bib_content):
+        name = parse_fields(body).get('pdf', '').strip()
+        if name and '://' not in name and pdf_dir / name not in paths:
+            paths.append(pdf_dir / name)
+    return paths
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalized_text(text: str) -> str:
+    # Text extraction may break lines differently after rewriting; compare words only
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def optimize_pdf(path: Path, dry_run: bool = False) -> Dict:
+    """
+    Rewrite one PDF (in place unless dry_run). Runs in a worker process.
+    Returns the manifest record for the file.
+    """
+    import pikepdf
+
+    before = path.stat().st_size
+    record = {'before': before, 'after': before}
+    fd, temp_name = tempfile.mkstemp(suffix='.pdf', dir=path.parent)
+    os.close(fd)
+    temp_path = Path(temp_name)
+    try:
+        try:
+            with pikepdf.open(path) as pdf:
+                pages = len(pdf.pages)
+                was_linearized = pdf.is_linearized
+                pdf.remove_unreferenced_resources()
+                pdf.save(temp_path, linearize=True, compress_streams=True, recompress_flate=True,
+                         object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        except pikepdf.PasswordError:
+            return {**record, 'status': 'skipped', 'reason': 'encrypted'}
+        except pikepdf.PdfError as e:
+            return {**record, 'status': 'failed', 'reason': str(e)}
+
+        with pikepdf.open(temp_path) as optimized:
+            new_pages = len(optimized.pages)
+        if new_pages != pages:
+            return {**record, 'status': 'failed', 'reason': f"page count changed ({pages} -> {new_pages})"}
+        original_text = _normalized_text(extract_first_page_text(str(path)))
+        new_text = _normalized_text(extract_first_page_text(str(temp_path)))
+        if new_text != original_text:
+            return {**record, 'status': 'failed', 'reason': 'first-page text changed'}
+
+        after = temp_path.stat().st_size
+        record['pages'] = pages
+        if after >= before and was_linearized:
+            return {**record, 'status': 'kept', 'linearized': True}
+        record.update(after=after, linearized=True, status='optimized')
+        if not dry_run:
+            # mkstemp creates the file owner-only; keep the original's permissions
+            shutil.copymode(path, temp_path)
+            os.replace(temp_path, path)
+        return record
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict]:
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    except ValueError:
+        return {}
+
+
+def optimize_pdfs(paths: List[Path], manifest_path: Optional[Path] = None, workers: Optional[int] = None,
+                  dry_run: bool = False, force: bool = False) -> Dict[str, Dict]:
+    """
+    Main function: optimize every changed PDF in paths.
+    Returns {file name: manifest record} for the files processed this run.
+    """
+    manifest = load_manifest(manifest_path) if manifest_path is not None and not force else {}
+    hashes = {path.name: file_sha256(path) for path in paths}
+    due = [path for path in paths if manifest.get(path.name, {}).get('sha256') != hashes[path.name]]
+    print(f"{len(paths)} PDFs, {len(paths) - len(due)} unchanged since the last run, optimizing {len(due)}")
+
+    results: Dict[str, Dict] = {}
+    if due:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, record in zip(due, executor.map(optimize_pdf, due, [dry_run] * len(due))):
+                results[path.name] = record
+                change = f"{record['before'] / 1e6:.2f} MB -> {record['after'] / 1e6:.2f} MB"
+                reason = f" ({record['reason']})" if 'reason' in record else ''
+                print(f"  {path.name}: {record['status']}, {change}{reason}")
+
+    if manifest_path is not None and not dry_run:
+        for path in due:
+            if results[path.name]['status'] == 'failed':
+                # Not recorded, so the next run tries the file again
+                manifest.pop(path.name, None)
+                continue
+            # Hash the file as it is now, so an optimized file isn't processed again
+            manifest[path.name] = {**results[path.name], 'sha256': file_sha256(path)}
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    return results
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Linearize and recompress the PDFs referenced from papers.bib.')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--dry-run', action='store_true', help='report the savings without replacing any file')
+    parser.add_argument('--force', action='store_true', help='process every file, ignoring the manifest')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    pdf_dir = repo_root / 'assets' / 'pdf'
+    if not bib_path.exists():
+        print(f"Error: papers.bib not found at {bib_path}")
+        exit(1)
+
+    paths = referenced_pdfs(bib_path.read_text(encoding='utf-8'), pdf_dir)
+    missing = [path for path in paths if not path.exists()]
+    for path in missing:
+        print(f"  Warning: {path.name} is referenced in papers.bib but not in {pdf_dir}")
+    paths = [path for path in paths if path.exists()]
+
+    results = optimize_pdfs(paths, repo_root / '.cache' / 'pdf' / 'manifest.json',
+                            workers=args.workers, dry_run=args.dry_run, force=args.force)
+    before = sum(record['before'] for record in results.values())
+    after = sum(record['after'] for record in results.values())
+    failed = sum(record['status'] == 'failed' for record in results.values())
+    if results:
+        print(f"\nTotal: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB"
+              f"{' (dry run, nothing replaced)' if args.dry_run else ''}")
+    if failed:
+        print(f"{failed} file(s) failed verification and were left unchanged")
+        exit(1)
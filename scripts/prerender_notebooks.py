@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Pre-render Jupyter notebooks under assets/jupyter to HTML, in parallel and cached
+
+This script:
+1. Finds every .ipynb under assets/jupyter
+2. Looks each one up in .cache/notebooks by the sha256 of its content; entries
+   rendered with a different nbconvert version count as stale
+3. Converts the missing/stale notebooks with nbconvert in a process pool
+4. Records the results in .cache/notebooks/manifest.json
+
+During `jekyll build`, _plugins/jupyter-notebook-cache.rb serves these cached
+HTML files instead of running nbconvert again for every notebook.
+
+Usage:
+    python scripts/prerender_notebooks.py [--workers N] [--execute]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import nbconvert
+import nbformat
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def notebook_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_manifest(cache_dir: Path) -> Dict[str, Dict]:
+    try:
+        with open(cache_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_notebook(notebook_path: Path, output_path: Path, execute: bool = False) -> Tuple[str, float]:
+    """Convert one notebook to HTML (runs in a worker process). Returns (notebook, seconds)."""
+    start = time.perf_counter()
+    notebook = nbformat.read(str(notebook_path), as_version=4)
+    if execute:
+        from nbconvert.preprocessors import ExecutePreprocessor
+        ExecutePreprocessor(timeout=600).preprocess(notebook, {'metadata': {'path': str(notebook_path.parent)}})
+    body, _ = nbconvert.HTMLExporter().from_notebook_node(notebook)
+
+    tmp_path = output_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(body, encoding='utf-8')
+    tmp_path.replace(output_path)
+    return str(notebook_path), time.perf_counter() - start
+
+
+def prerender_notebooks(notebooks: List[Path], cache_dir: Path, workers: Optional[int] = None,
+                        execute: bool = False, force: bool = False) -> Dict[str, Dict]:
+    """
+    Main function: bring the HTML cache up to date for the given notebooks.
+    Returns the updated manifest ({content sha256: {notebook, nbconvert, executed}}).
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    version = nbconvert.__version__
+
+    todo = []
+    current = {}
+    for path in notebooks:
+        digest = notebook_hash(path)
+        current[digest] = {'notebook': str(path), 'nbconvert': version, 'executed': execute}
+        cached = manifest.get(digest, {})
+        stale = (cached.get('nbconvert'), cached.get('executed')) != (version, execute)
+        if force or stale or not (cache_dir / f"{digest}.html").exists():
+            todo.append((path, digest))
+
+    print(f"Found {len(notebooks)} notebooks, {len(notebooks) - len(todo)} cached, "
+          f"{len(todo)} to render (nbconvert {version})")
+
+    if todo:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(render_notebook, path, cache_dir / f"{digest}.html", execute)
+                for path, digest in todo
+            ]
+            for future in futures:
+                notebook, seconds = future.result()
+                print(f"  Rendered {notebook} ({seconds:.2f}s)")
+        print(f"Rendered {len(todo)} notebooks in {time.perf_counter() - start:.2f}s")
+
+    # Drop HTML for notebooks that no longer exist (or changed)
+    for digest in set(manifest) - set(current):
+        (cache_dir / f"{digest}.html").unlink(missing_ok=True)
+
+    with open(cache_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2, sort_keys=True)
+    return current
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).resolve().parent.parent
+
+    parser = argparse.ArgumentParser(description='Pre-render notebooks in assets/jupyter to cached HTML.')
+    parser.add_argument('--notebook-dir', type=Path, default=repo_root / 'assets' / 'jupyter')
+    parser.add_argument('--cache-dir', type=Path, default=repo_root / '.cache' / 'notebooks')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--execute', action='store_true', help='execute notebooks before converting')
+    parser.add_argument('--force', action='store_true', help='re-render everything')
+    args = parser.parse_args()
+
+    notebooks = sorted(
+        path for path in args.notebook_dir.rglob('*.ipynb')
+        if '.ipynb_checkpoints' not in path.parts
+    )
+    prerender_notebooks(notebooks, args.cache_dir, workers=args.workers,
+                        execute=args.execute, force=args.force)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Precompute publication aggregates for the people and publications pages
+
+This script:
+1. Reads papers.bib, members.yml and the site owner's name from _config.yml
+2. Resolves every author once (lab members through the same name variants as
+   update_member_publications.py, memoized per distinct spelling)
+3. Computes per-entry flags (which authors are corresponding authors, whether
+   the first author is a lab member or the site owner), per-member counts by
+   year and category with first- and corresponding-author counts, and per-year
+   and per-category counts, each with its entry keys pre-sorted (newest first)
+4. Writes _data/publication_stats.yml, so templates look values up instead of
+   looping over authors and members
+
+Usage:
+    python scripts/publication_stats.py
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+import yaml
+
+from export_bibliography import SUPERSCRIPTS, parse_fields, split_entries
+from latex_unicode import latex_to_unicode
+from update_member_publications import MEMBER_CATEGORIES, extract_author_names, normalize_name
+
+HEADER = (
+    "# Generated by scripts/publication_stats.py from papers.bib, members.yml and _config.yml. Do not edit.\n"
+    "# Per-entry author flags and per-member, per-year and per-category counts for the templates.\n"
+)
+
+
+def display_name(author: str) -> str:
+    """'Mak, Macau K. F.' -> 'Macau K. F. Mak', with LaTeX and superscript markers removed."""
+    author = SUPERSCRIPTS.sub('', latex_to_unicode(author)).strip()
+    if ',' in author:
+        last, first = (part.strip() for part in author.split(',', 1))
+        return f"{first} {last}".strip()
+    return re.sub(r'\s+', ' ', author)
+
+
+def author_key(name: str) -> str:
+    """Normalized 'last, first' key: accents, case, dots and middle names dropped."""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    parts = re.sub(r'[^a-z\s-]', ' ', ascii_name).split()
+    if not parts:
+        return name.lower()
+    return f"{parts[-1]}, {parts[0]}" if len(parts) > 1 else parts[0]
+
+
+class AuthorResolver:
+    """Maps author spellings to node ids; roster names are matched through their name variants."""
+
+    def __init__(self, roster: Dict[str, str]):
+        # roster: name -> role (a members.yml category, or 'owner')
+        self.roster = roster
+        self._variants = {variant: name for name in roster for variant in normalize_name(name)}
+        self.resolve = lru_cache(maxsize=None)(self._resolve)
+        self.variants = lru_cache(maxsize=None)(lambda author: frozenset(normalize_name(display_name(author))))
+
+    def _resolve(self, author: str) -> Tuple[str, str]:
+        """(node id, display name) for one author spelling."""
+        name = display_name(author)
+        for variant in normalize_name(name):
+            if variant in self._variants:
+                member = self._variants[variant]
+                return member, member
+        return author_key(name), name
+
+
+def load_roster(members_data: Dict, owner: Optional[str] = None) -> Dict[str, str]:
+    """Roster name -> role: the site owner first, then members.yml in category order."""
+    roster = {}
+    if owner:
+        roster[owner] = 'owner'
+    for category in MEMBER_CATEGORIES:
+        for member in (members_data or {}).get(category) or []:
+            if member.get('name'):
+                roster[member['name']] = category
+    return roster
+
+
+def load_owner(config_path: Path) -> Optional[str]:
+    """'first_name last_name' from _config.yml."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    return ' '.join(filter(None, [config.get('first_name'), config.get('last_name')])) or None
+
+
+def _counter(groups: Dict, name, key: str):
+    group = groups.setdefault(name, {'count': 0, 'keys': []})
+    group['count'] += 1
+    group['keys'].append(key)
+
+
+def publication_stats(bib_content: str, roster: Dict[str, str]) -> Dict:
+    """
+    Main function: the aggregates written to _data/publication_stats.yml.
+    """
+    resolver = AuthorResolver(roster)
+    entries = []
+    for position, (_, key, body, _) in enumerate(split_entries(bib_content)):
+        fields = parse_fields(body)
+        year = re.search(r'\d{4}', fields.get('year', ''))
+        authors = extract_author_names(fields['author']) if fields.get('author') else []
+        nodes = [resolver.resolve(author)[0] for author in authors]
+        corresponding_variants: Set[str] = set()
+        for name in extract_author_names(fields['corresponding']) if fields.get('corresponding') else []:
+            corresponding_variants |= resolver.variants(name)
+        corresponding = [i for i, author in enumerate(authors) if resolver.variants(author) & corresponding_variants]
+        entries.append({
+            'key': key,
+            'position': position,
+            'year': int(year.group(0)) if year else None,
+            'category': fields.get('category', '').strip() or None,
+            'nodes': nodes,
+            'corresponding': corresponding,
+        })
+
+    # Newest first, file order within a year (the order of the publications page)
+    entries.sort(key=lambda e: (-(e['year'] or 0), e['position']))
+
+    stats = {'total': len(entries), 'years': {}, 'categories': {}, 'members': {}, 'entries': {}}
+    for entry in entries:
+        key, nodes = entry['key'], entry['nodes']
+        if entry['year'] is not None:
+            _counter(stats['years'], entry['year'], key)
+        if entry['category']:
+            _counter(stats['categories'], entry['category'], key)
+
+        corresponding_nodes = {nodes[i] for i in entry['corresponding']}
+        lab_authors = list(dict.fromkeys(node for node in nodes if node in roster))
+        stats['entries'][key] = {
+            'year': entry['year'],
+            'category': entry['category'],
+            'lab_authors': lab_authors,
+            'first_author': nodes[0] if nodes and nodes[0] in roster else None,
+            'corresponding': entry['corresponding'],
+        }
+        for name in lab_authors:
+            member = stats['members'].setdefault(name, {
+                'role': roster[name], 'count': 0, 'first_author': 0, 'corresponding': 0,
+                'years': {}, 'categories': {}, 'keys': [],
+            })
+            member['count'] += 1
+            member['first_author'] += int(nodes[0] == name)
+            member['corresponding'] += int(name in corresponding_nodes)
+            if entry['year'] is not None:
+                member['years'][entry['year']] = member['years'].get(entry['year'], 0) + 1
+            if entry['category']:
+                member['categories'][entry['category']] = member['categories'].get(entry['category'], 0) + 1
+            member['keys'].append(key)
+    return stats
+
+
+def write_publication_stats(stats: Dict, output_path: Path) -> bool:
+    """Write the aggregates; returns False if the file already had this content."""
+    content = HEADER + yaml.dump(stats, sort_keys=False, width=1000, allow_unicode=True)
+    if output_path.exists() and output_path.read_text(encoding='utf-8') == content:
+        return False
+    output_path.write_text(content, encoding='utf-8')
+    return True
+
+
+def update_publication_stats(repo_root: Path, bib_content: Optional[str] = None,
+                             members_data: Optional[Dict] = None) -> Dict:
+    """Compute and write _data/publication_stats.yml for the site at repo_root."""
+    if bib_content is None:
+        bib_content = (repo_root / '_bibliography' / 'papers.bib').read_text(encoding='utf-8')
+    if members_data is None:
+        with open(repo_root / '_data' / 'members.yml', 'r', encoding='utf-8') as f:
+            members_data = yaml.safe_load(f)
+    roster = load_roster(members_data, load_owner(repo_root / '_config.yml'))
+    stats = publication_stats(bib_content, roster)
+
+    output_path = repo_root / '_data' / 'publication_stats.yml'
+    if write_publication_stats(stats, output_path):
+        print(f"Publication stats saved to {output_path}")
+    else:
+        print(f"No changes in {output_path}")
+    return stats
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    for path in (repo_root / '_bibliography' / 'papers.bib', repo_root / '_data' / 'members.yml',
+                 repo_root / '_config.yml'):
+        if not path.exists():
+            print(f"Error: {path.name} not found at {path}")
+            exit(1)
+
+    stats = update_publication_stats(repo_root)
+    print(f"{stats['total']} publications, {len(stats['members'])} lab authors, "
+          f"{len(stats['years'])} years, {len(stats['categories'])} categories")
+    for name, member in stats['members'].items():
+        print(f"  {name}: {member['count']} ({member['first_author']} first-author, "
+              f"{member['corresponding']} corresponding)")
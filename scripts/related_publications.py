@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Find related publications from the titles and abstracts in papers.bib
+
+This script:
+1. Tokenizes the title and abstract of each entry (LaTeX converted with
+   latex_unicode.py), reusing cached tokens for entries whose text is unchanged
+2. Builds a sparse TF-IDF matrix (sublinear term frequency, smoothed inverse
+   document frequency, rows L2-normalized) with SciPy
+3. Computes the cosine similarity of every entry with every other entry as
+   batched sparse matrix products and keeps the top --top-k per entry above
+   --min-similarity
+4. Writes _data/related_publications.yml, which _layouts/bib.liquid shows under
+   each entry
+
+Usage:
+    python scripts/related_publications.py [--top-k 3] [--min-similarity 0.1]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+from scipy import sparse
+
+from export_bibliography import parse_fields, plain_text, split_entries
+
+HEADER = (
+    "# Generated by scripts/related_publications.py from papers.bib. Do not edit.\n"
+    "# Maps each papers.bib entry key to its most similar entries (TF-IDF over title and abstract).\n"
+)
+BATCH_ROWS = 256  # rows of the similarity matrix held in memory at once
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9]+(?:[-'][a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a about above after again against all also am among an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having he
+her here hers him his how however i if in into is it its itself just may me might more most must my no nor not
+now of off on once only or other our ours out over own per same she should so some such than that the their
+theirs them then there these they this those through thus to too under until up upon us very via was we were
+what when where which while who whom why will with within without would you your
+""".split())
+
+
+def tokenize(text: str) -> Dict[str, int]:
+    """Term counts of a title + abstract."""
+    words = TOKEN_PATTERN.findall(plain_text(text).lower())
+    return dict(Counter(word for word in words if word not in STOPWORDS and len(word) > 2))
+
+
+def load_documents(bib_content: str) -> List[Tuple[str, str, str]]:
+    """(key, plain-text title, title + abstract) for each entry."""
+    documents = []
+    for _, key, body, _ in split_entries(bib_content):
+        fields = parse_fields(body)
+        title = fields.get('title', '')
+        documents.append((key, plain_text(title), f"{title}\n{fields.get('abstract', '')}"))
+    return documents
+
+
+def tokenize_documents(documents: List[Tuple[str, str, str]],
+                       cache_path: Optional[Path] = None) -> List[Dict[str, int]]:
+    """Term counts per document; unchanged texts are read from the cache."""
+    cache: Dict[str, Dict] = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text(encoding='utf-8'))
+        except ValueError:
+            cache = {}
+
+    counts, updated, tokenized = [], {}, 0
+    for key, _, text in documents:
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        cached = cache.get(key)
+        if cached is None or cached['hash'] != digest:
+            cached = {'hash': digest, 'terms': tokenize(text)}
+            tokenized += 1
+        updated[key] = cached
+        counts.append(cached['terms'])
+
+    print(f"Tokenized {tokenized} of {len(documents)} entries ({len(documents) - tokenized} cached)")
+    if cache_path is not None and tokenized:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(updated, ensure_ascii=False), encoding='utf-8')
+    return counts
+
+
+def tfidf_matrix(term_counts: List[Dict[str, int]]) -> sparse.csr_matrix:
+    """Row-normalized TF-IDF matrix (documents x terms)."""
+    vocabulary: Dict[str, int] = {}
+    indptr, indices, values = [0], [], []
+    for counts in term_counts:
+        for term, n in counts.items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(n)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(term_counts), len(vocabulary)),
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(term_counts)) / (1 + document_frequency)) + 1.0
+    matrix = matrix @ sparse.diags(idf.astype(np.float32))
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags((1.0 / norms).astype(np.float32)) @ matrix)
+
+
+def top_neighbours(matrix: sparse.csr_matrix, top_k: int, min_similarity: float,
+                   batch_rows: int = BATCH_ROWS) -> List[List[Tuple[int, float]]]:
+    """For each row, up to top_k (row, cosine similarity) pairs, most similar first."""
+    n = matrix.shape[0]
+    k = min(top_k, n - 1)
+    neighbours: List[List[Tuple[int, float]]] = []
+    for start in range(0, n, batch_rows):
+        stop = min(start + batch_rows, n)
+        # Sparse x dense block: the similarities are dense anyway, and this is
+        # several times faster than a sparse x sparse product
+        similarities = (matrix @ matrix[start:stop].T.toarray()).T
+        similarities[np.arange(stop - start), np.arange(start, stop)] = -1.0  # not related to itself
+        if k <= 0:
+            neighbours.extend([] for _ in range(start, stop))
+            continue
+        candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(similarities, candidates, axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        for row_candidates, row_scores in zip(candidates, scores):
+            neighbours.append([(int(j), float(s)) for j, s in zip(row_candidates, row_scores) if s >= min_similarity])
+    return neighbours
+
+
+def related_publications(bib_content: str, top_k: int = 3, min_similarity: float = 0.1,
+                         cache_path: Optional[Path] = None) -> Dict[str, List[Dict]]:
+    """
+    Main function: {entry key: [{'key', 'title', 'similarity'}, ...]} for papers.bib.
+    """
+    documents = load_documents(bib_content)
+    if len(documents) < 2:
+        return {}
+    matrix = tfidf_matrix(tokenize_documents(documents, cache_path))
+    related = {}
+    for (key, _, _), neighbours in zip(documents, top_neighbours(matrix, top_k, min_similarity)):
+        if neighbours:
+            related[key] = [{'key': documents[j][0], 'title': documents[j][1], 'similarity': round(score, 3)}
+                            for j, score in neighbours]
+    return related
+
+
+def write_related(related: Dict[str, List[Dict]], output_path: Path) -> bool:
+    """Write the per-key map; returns False if the file already had this content."""
+    content = HEADER + (yaml.dump(related, sort_keys=True, width=1000, allow_unicode=True) if related else '{}\n')
+    if output_path.exists() and output_path.read_text(encoding='utf-8') == content:
+        return False
+    output_path.write_text(content, encoding='utf-8')
+    return True
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Find related publications by TF-IDF similarity of title and abstract.')
+    parser.add_argument('--top-k', type=int, default=3, help='related entries per entry (default: %(default)s)')
+    parser.add_argument('--min-similarity', type=float, default=0.1,
+                        help='minimum cosine similarity to list an entry (default: %(default)s)')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    output_path = repo_root / '_data' / 'related_publications.yml'
+    if not bib_path.exists():
+        print(f"Error: papers.bib not found at {bib_path}")
+        exit(1)
+
+    related = related_publications(bib_path.read_text(encoding='utf-8'), args.top_k, args.min_similarity,
+                                   cache_path=repo_root / '.cache' / 'related' / 'tokens.json')
+    print(f"Found related publications for {len(related)} entries")
+    if write_related(related, output_path):
+        print(f"Related publications saved to {output_path}")
+    else:
+        print(f"No changes in {output_path}")
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Run the website maintenance scripts as one pipeline
+
+This script:
+1. Reads papers.bib and members.yml once and shares the parsed data between stages
+2. Runs the stages in dependency order, running independent stages concurrently
+   (e.g. the Google Scholar fetch alongside the local PDF checks)
+3. Skips stages whose inputs haven't changed since their last successful run
+
+Stages:
+    scholar_citations    bin/update_scholar_citations.py (network; skips itself if updated today)
+    scholar_join         scripts/scholar_bib_join.py (after scholar_citations)
+    member_publications  scripts/update_member_publications.py (member_shards.py if _members/ exists),
+                         then scripts/publication_stats.py
+    verify_pdfs          _scripts/verify_bib_against_pdfs.py
+    ris_comparison       _scripts/detailed_comparison_fixed.py (only with --ris)
+    related_publications scripts/related_publications.py (needs numpy and scipy)
+    collaboration_network scripts/collaboration_network.py (needs numpy and scipy)
+
+Usage:
+    python scripts/run_pipeline.py
+    python scripts/run_pipeline.py --ris ~/zotero/export.ris --skip scholar_citations
+    python scripts/run_pipeline.py --only member_publications --force
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+import member_shards
+import publication_stats
+import scholar_bib_join
+import update_member_publications
+from instrumentation import add_profile_argument, print_summary, profiling, span
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STATE_FILE = Path('.cache') / 'pipeline' / 'state.json'
+
+
+def load_script(path: Path) -> ModuleType:
+    """Import a standalone script (from bin/ or _scripts/) as a module."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class PipelineContext:
+    """
+    Paths and shared in-memory data for one pipeline run.
+
+    Parsed data is computed lazily, at most once, and shared by every stage.
+    """
+
+    def __init__(self, repo_root: Path, ris_path: Optional[Path] = None,
+                 report_dir: Optional[Path] = None):
+        self.repo_root = repo_root
+        self.bib_path = repo_root / '_bibliography' / 'papers.bib'
+        self.members_path = repo_root / '_data' / 'members.yml'
+        self.member_shard_dir = repo_root / '_members'
+        self.citations_path = repo_root / '_data' / 'citations.yml'
+        self.citation_counts_path = repo_root / '_data' / 'citation_counts.yml'
+        self.related_path = repo_root / '_data' / 'related_publications.yml'
+        self.network_path = repo_root / '_data' / 'collaboration_network.yml'
+        self.publication_stats_path = repo_root / '_data' / 'publication_stats.yml'
+        self.pdf_dir = repo_root / 'assets' / 'pdf'
+        self.ris_path = ris_path
+        self.report_dir = report_dir or repo_root / '.cache' / 'pipeline' / 'reports'
+        # Re-entrant: loading one piece of data may load another (bib text -> entries)
+        self._lock = threading.RLock()
+        self._cache: Dict[str, object] = {}
+
+    def _once(self, name: str, factory: Callable):
+        with self._lock:
+            if name not in self._cache:
+                with span('load', data=name):
+                    self._cache[name] = factory()
+            return self._cache[name]
+
+    @property
+    def bib_text(self) -> str:
+        return self._once('bib_text', lambda: self.bib_path.read_text(encoding='utf-8'))
+
+    @property
+    def publications(self) -> List[Dict]:
+        """papers.bib in the update_member_publications format."""
+        return self._once('publications',
+                          lambda: update_member_publications.parse_bibtex_string(self.bib_text))
+
+    @property
+    def bibtex_entries(self) -> Dict[str, Dict]:
+        """papers.bib in the {key: {'type', 'fields'}} format used by the _scripts tools."""
+        comparison = self.script('_scripts/detailed_comparison_fixed.py')
+        return self._once('bibtex_entries', lambda: comparison.parse_bibtex_string(self.bib_text))
+
+    @property
+    def members_data(self) -> Dict:
+        def load():
+            with open(self.members_path, 'r', encoding='utf-8') as f:
+                return yaml.safe_load(f)
+        return self._once('members_data', load)
+
+    def script(self, relative_path: str) -> ModuleType:
+        return self._once(f"script:{relative_path}", lambda: load_script(self.repo_root / relative_path))
+
+
+class Stage:
+    """
+    A pipeline stage.
+
+    `inputs(ctx)` lists the files whose content decides whether the stage is up
+    to date; stages without inputs always run. `outputs(ctx)` must all exist
+    for a stage to be skipped.
+    """
+
+    def __init__(self, name: str, run: Callable[[PipelineContext], None], deps: tuple = (),
+                 inputs: Optional[Callable[[PipelineContext], List[Path]]] = None,
+                 outputs: Optional[Callable[[PipelineContext], List[Path]]] = None):
+        self.name = name
+        self.run = run
+        self.deps = deps
+        self.inputs = inputs
+        self.outputs = outputs or (lambda ctx: [])
+
+
+def _referenced_pdfs(ctx: PipelineContext) -> List[Path]:
+    return sorted(
+        ctx.pdf_dir / entry['fields']['pdf']
+        for entry in ctx.bibtex_entries.values()
+        if 'pdf' in entry['fields']
+    )
+
+
+def run_scholar_citations(ctx: PipelineContext):
+    module = ctx.script('bin/update_scholar_citations.py')
+    module.get_scholar_citations()
+
+
+def run_scholar_join(ctx: PipelineContext):
+    with open(ctx.citations_path, 'r', encoding='utf-8') as f:
+        papers = (yaml.safe_load(f) or {}).get('papers') or {}
+    counts = scholar_bib_join.join_citations(papers, ctx.publications)
+    print(f"Matched {len(counts)} papers.bib entries to Google Scholar publications")
+    scholar_bib_join.write_citation_counts(counts, ctx.citation_counts_path)
+
+
+def run_member_publications(ctx: PipelineContext):
+    if ctx.member_shard_dir.exists():
+        member_shards.update_member_shards(
+            ctx.member_shard_dir, ctx.members_path, ctx.bib_path, publications=ctx.publications,
+            cache=member_shards.ShardCache(ctx.repo_root / '.cache' / 'members' / 'shards.pickle'),
+        )
+        publication_stats.update_publication_stats(ctx.repo_root, ctx.bib_text)
+        return
+    update_member_publications.update_members_file(
+        ctx.members_path, ctx.bib_path,
+        publications=ctx.publications, members_data=ctx.members_data,
+    )
+    publication_stats.update_publication_stats(ctx.repo_root, ctx.bib_text, ctx.members_data)
+
+
+def run_verify_pdfs(ctx: PipelineContext):
+    module = ctx.script('_scripts/verify_bib_against_pdfs.py')
+    entries = [
+        {'type': entry['type'], 'key': key, 'fields': entry['fields']}
+        for key, entry in ctx.bibtex_entries.items()
+    ]
+    module.main(entries=entries, pdf_dir=str(ctx.pdf_dir),
+                output_report=str(ctx.report_dir / 'verification_report.txt'))
+
+
+def run_ris_comparison(ctx: PipelineContext):
+    module = ctx.script('_scripts/detailed_comparison_fixed.py')
+    module.main(bibtex_entries=ctx.bibtex_entries, ris_file=str(ctx.ris_path),
+                output_report=str(ctx.report_dir / 'zotero_bibtex_detailed_comparison.txt'))
+
+
+def run_related_publications(ctx: PipelineContext):
+    # Loaded on demand so the other stages don't need numpy and scipy
+    module = ctx.script('scripts/related_publications.py')
+    related = module.related_publications(ctx.bib_text, cache_path=ctx.repo_root / '.cache' / 'related' / 'tokens.json')
+    module.write_related(related, ctx.related_path)
+
+
+def run_collaboration_network(ctx: PipelineContext):
+    module = ctx.script('scripts/collaboration_network.py')
+    roster = publication_stats.load_roster(ctx.members_data, publication_stats.load_owner(ctx.repo_root / '_config.yml'))
+    network = module.collaboration_network(ctx.bib_text, roster)
+    module.write_network(network, ctx.network_path)
+
+
+STAGES = [
+    Stage('scholar_citations', run_scholar_citations),
+    Stage('scholar_join', run_scholar_join, deps=('scholar_citations',),
+          inputs=lambda ctx: [ctx.citations_path, ctx.bib_path],
+          outputs=lambda ctx: [ctx.citation_counts_path]),
+    Stage('member_publications', run_member_publications,
+          inputs=lambda ctx: ([ctx.bib_path, ctx.members_path, ctx.repo_root / '_config.yml']
+                              + member_shards.shard_paths(ctx.member_shard_dir)),
+          outputs=lambda ctx: [ctx.members_path, ctx.publication_stats_path]),
+    Stage('verify_pdfs', run_verify_pdfs,
+          inputs=lambda ctx: [ctx.bib_path] + _referenced_pdfs(ctx),
+          outputs=lambda ctx: [ctx.report_dir / 'verification_report.txt']),
+    Stage('ris_comparison', run_ris_comparison,
+          inputs=lambda ctx: [ctx.bib_path, ctx.ris_path],
+          outputs=lambda ctx: [ctx.report_dir / 'zotero_bibtex_detailed_comparison.txt']),
+    Stage('related_publications', run_related_publications,
+          inputs=lambda ctx: [ctx.bib_path],
+          outputs=lambda ctx: [ctx.related_path]),
+    Stage('collaboration_network', run_collaboration_network, deps=('member_publications',),
+          inputs=lambda ctx: [ctx.bib_path, ctx.members_path, ctx.repo_root / '_config.yml'],
+          outputs=lambda ctx: [ctx.network_path]),
+]
+
+
+def hash_inputs(paths: List[Path]) -> str:
+    """Combined sha256 over the names and contents of the given files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(path).encode('utf-8'))
+        if path.exists():
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        else:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+class StateStore:
+    """Input hashes of the last successful run of each stage, persisted as JSON."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.hashes = json.load(f)
+        except (OSError, ValueError):
+            self.hashes = {}
+
+    def get(self, stage: str) -> Optional[str]:
+        with self._lock:
+            return self.hashes.get(stage)
+
+    def set(self, stage: str, value: str):
+        with self._lock:
+            self.hashes[stage] = value
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.hashes, f, indent=2)
+
+
+def _execute(stage: Stage, ctx: PipelineContext, state: StateStore, force: bool) -> str:
+    input_hash = None
+    if stage.inputs is not None:
+        input_hash = hash_inputs(stage.inputs(ctx))
+        outputs_exist = all(path.exists() for path in stage.outputs(ctx))
+        if not force and outputs_exist and state.get(stage.name) == input_hash:
+            return 'up to date'
+
+    print(f"\n[{stage.name}] starting")
+    with span(stage.name):
+        stage.run(ctx)
+
+    if stage.inputs is not None:
+        # Hash again: a stage may rewrite its own inputs (e.g. members.yml)
+        state.set(stage.name, hash_inputs(stage.inputs(ctx)))
+    return 'ran'
+
+
+def run_pipeline(stages: List[Stage], ctx: PipelineContext, state: StateStore,
+                 workers: int = 4, force: bool = False) -> Dict[str, str]:
+    """
+    Run stages respecting their dependencies; independent stages run in parallel.
+    Returns {stage name: status}.
+    """
+    selected = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in {s.name for s in STAGES}]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {unknown}")
+
+    ctx.report_dir.mkdir(parents=True, exist_ok=True)
+    pending = {stage.name: stage for stage in stages}
+    status: Dict[str, str] = {}
+    timings: Dict[str, float] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                # Dependencies outside the selected stages count as satisfied
+                deps = [dep for dep in stage.deps if dep in selected]
+                if any(status.get(dep) in ('failed', 'skipped') for dep in deps):
+                    status[name] = 'skipped'
+                    del pending[name]
+                elif all(dep in status for dep in deps):
+                    future = executor.submit(_execute, stage, ctx, state, force)
+                    running[future] = (name, time.perf_counter())
+                    del pending[name]
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, started = running.pop(future)
+                timings[name] = time.perf_counter() - started
+                try:
+                    status[name] = future.result()
+                except BaseException as e:  # scripts call sys.exit() on errors
+                    status[name] = 'failed'
+                    print(f"\n[{name}] failed: {e!r}")
+                    if not isinstance(e, SystemExit):
+                        traceback.print_exc()
+
+    print("\nPipeline summary:")
+    for stage in stages:
+        seconds = f"{timings[stage.name]:.2f}s" if stage.name in timings else ''
+        print(f"  {stage.name:<22} {status.get(stage.name, 'skipped'):<12} {seconds}")
+    return status
+
+
+if __name__ == '__main__':
+    stage_names = [stage.name for stage in STAGES]
+
+    parser = argparse.ArgumentParser(description='Run the maintenance scripts as one pipeline.')
+    parser.add_argument('--ris', type=Path, help='Zotero RIS export to compare papers.bib against')
+    parser.add_argument('--only', nargs='+', choices=stage_names, help='run only these stages')
+    parser.add_argument('--skip', nargs='+', choices=stage_names, default=[], help='leave out these stages')
+    parser.add_argument('--force', action='store_true', help='run stages even if their inputs are unchanged')
+    parser.add_argument('--workers', type=int, default=4, help='stages run in parallel (default: %(default)s)')
+    parser.add_argument('--report-dir', type=Path, help='where report stages write their output')
+    parser.add_argument('--state-file', type=Path, default=REPO_ROOT / DEFAULT_STATE_FILE)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    # bin/update_scholar_citations.py resolves its paths relative to the repository root
+    os.chdir(REPO_ROOT)
+
+    selected = [
+        stage for stage in STAGES
+        if (not args.only or stage.name in args.only)
+        and stage.name not in args.skip
+        and (stage.name != 'ris_comparison' or args.ris)
+    ]
+
+    context = PipelineContext(REPO_ROOT, ris_path=args.ris, report_dir=args.report_dir)
+    with profiling(args.profile):
+        results = run_pipeline(selected, context, StateStore(args.state_file),
+                               workers=args.workers, force=args.force)
+    print_summary()
+
+    if 'failed' in results.values():
+        exit(1)
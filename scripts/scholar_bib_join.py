@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Link Google Scholar publications in citations.yml to papers.bib entry keys
+
+This script:
+1. Parses papers.bib and indexes every entry by normalized title (and year)
+2. Looks up each Scholar publication from _data/citations.yml in that index
+3. Writes _data/citation_counts.yml, a compact map from bib entry key to its
+   Scholar id and citation count, which the site reads at build time instead
+   of scraping Scholar
+
+bin/update_scholar_citations.py runs this automatically after each fetch.
+
+Usage:
+    python scripts/scholar_bib_join.py
+    python scripts/scholar_bib_join.py --prune [--allowlist ids.yml]   # also shrink citations.yml
+"""
+
+import argparse
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import yaml
+
+from update_member_publications import clean_latex_escapes, parse_bibtex_file
+
+HEADER = (
+    "# Generated by scripts/scholar_bib_join.py from citations.yml and papers.bib. Do not edit.\n"
+    "# Maps each papers.bib entry key to its Google Scholar id and citation count.\n"
+)
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip LaTeX markup, accents and punctuation, collapse whitespace."""
+    title = clean_latex_escapes(title).replace('{', '').replace('}', '')
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(ch for ch in title if not unicodedata.combining(ch))
+    title = re.sub(r'[^\w\s]', ' ', title.lower())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def _year(value) -> Optional[int]:
+    match = re.search(r'\d{4}', str(value or ''))
+    return int(match.group(0)) if match else None
+
+
+class TitleIndex:
+    """papers.bib entries indexed by full normalized title and by main title (before ':')."""
+
+    def __init__(self, publications: List[Dict]):
+        self.by_title: Dict[str, List[Tuple[Optional[int], str]]] = {}
+        self.by_main_title: Dict[str, List[Tuple[Optional[int], str]]] = {}
+        for pub in publications:
+            if not pub.get('title'):
+                continue
+            record = (pub.get('year'), pub['entry_key'].strip())
+            self.by_title.setdefault(normalize_title(pub['title']), []).append(record)
+            main_title = normalize_title(pub['title'].split(':', 1)[0])
+            self.by_main_title.setdefault(main_title, []).append(record)
+
+    @staticmethod
+    def _pick(candidates: List[Tuple[Optional[int], str]], year: Optional[int]) -> Optional[str]:
+        if year is not None:
+            # Scholar years are often off by one (online-first vs. print)
+            candidates = [c for c in candidates if c[0] is None or abs(c[0] - year) <= 1]
+            candidates.sort(key=lambda c: abs(c[0] - year) if c[0] is not None else 2)
+        return candidates[0][1] if candidates else None
+
+    def lookup(self, title: str, year=None) -> Optional[str]:
+        year = _year(year)
+        key = self._pick(list(self.by_title.get(normalize_title(title), [])), year)
+        if key is None:
+            main_title = normalize_title(title.split(':', 1)[0])
+            candidates = self.by_main_title.get(main_title, [])
+            # Only trust a main-title match if it is unambiguous
+            if len({c[1] for c in candidates}) == 1:
+                key = self._pick(list(candidates), year)
+        return key
+
+
+def join_citations(papers: Dict[str, Dict], publications: List[Dict]) -> Dict[str, Dict]:
+    """
+    Match Scholar papers ({pub_id: {title, year, citations}}) to bib entries.
+    Returns {entry_key: {'scholar_id': pub_id, 'citations': n}}.
+    """
+    index = TitleIndex(publications)
+    bib_keys = {pub['entry_key'].strip() for pub in publications}
+    counts: Dict[str, Dict] = {}
+    for pub_id, paper in papers.items():
+        if paper.get('key'):
+            # Pruned citations.yml (see prune_papers) already records the entry key
+            key = paper['key'] if paper['key'] in bib_keys else None
+        else:
+            key = index.lookup(paper.get('title', ''), paper.get('year'))
+        if key is None:
+            continue
+        citations = int(paper.get('citations') or 0)
+        # Scholar sometimes lists a paper twice; keep the better-cited record
+        if key not in counts or citations > counts[key]['citations']:
+            counts[key] = {'scholar_id': pub_id, 'citations': citations}
+    return dict(sorted(counts.items()))
+
+
+def load_allowlist(allowlist_path: Optional[Path]) -> Set[str]:
+    """Read a YAML list of Scholar publication ids to keep regardless of papers.bib."""
+    if allowlist_path is None:
+        return set()
+    with open(allowlist_path, 'r', encoding='utf-8') as f:
+        return {str(pub_id) for pub_id in yaml.safe_load(f) or []}
+
+
+def prune_papers(papers: Dict[str, Dict], counts: Dict[str, Dict],
+                 allowlist: Set[str] = frozenset()) -> Dict[str, Dict]:
+    """
+    Keep only Scholar papers that matched a papers.bib entry or are allowlisted,
+    reduced to their citation count (plus the matched entry key).
+
+    Allowlist ids may be given with or without the "USERID:" prefix.
+    """
+    key_by_pub_id = {count['scholar_id']: key for key, count in counts.items()}
+    pruned = {}
+    for pub_id, paper in papers.items():
+        key = key_by_pub_id.get(pub_id)
+        if key is None and pub_id not in allowlist and pub_id.split(':')[-1] not in allowlist:
+            continue
+        pruned[pub_id] = {'citations': paper.get('citations', 0)}
+        if key is not None:
+            pruned[pub_id]['key'] = key
+    return dict(sorted(pruned.items()))
+
+
+def write_citation_counts(counts: Dict[str, Dict], output_path: Path) -> bool:
+    """Write the per-key map; returns False if the file already had this content."""
+    content = HEADER + (yaml.dump(counts, sort_keys=True, width=1000) if counts else '{}\n')
+    if output_path.exists() and output_path.read_text(encoding='utf-8') == content:
+        return False
+    output_path.write_text(content, encoding='utf-8')
+    return True
+
+
+def update_citation_counts(citations_path: Path, bib_path: Path, output_path: Path,
+                           papers: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """
+    Main function: join citations.yml (or the given papers dict) with papers.bib
+    and write the per-key citation counts.
+    """
+    if papers is None:
+        with open(citations_path, 'r', encoding='utf-8') as f:
+            papers = (yaml.safe_load(f) or {}).get('papers') or {}
+
+    publications = parse_bibtex_file(bib_path)
+    counts = join_citations(papers, publications)
+    print(f"Matched {len(counts)} of {len(publications)} papers.bib entries "
+          f"to {len(papers)} Google Scholar publications")
+
+    if write_citation_counts(counts, output_path):
+        print(f"Citation counts saved to {output_path}")
+    else:
+        print(f"No changes in {output_path}")
+    return counts
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Link citations.yml publications to papers.bib entry keys.')
+    parser.add_argument('--prune', action='store_true',
+                        help='also rewrite citations.yml keeping only matched/allowlisted publications')
+    parser.add_argument('--allowlist', type=Path, help='YAML list of Scholar publication ids to keep with --prune')
+    parser.add_argument('--archive', type=Path, default=repo_root / '.cache' / 'scholar' / 'citations_full.yml',
+                        help='where --prune saves the full citations.yml (default: %(default)s)')
+    args = parser.parse_args()
+
+    citations_path = repo_root / '_data' / 'citations.yml'
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    output_path = repo_root / '_data' / 'citation_counts.yml'
+
+    for path in (citations_path, bib_path):
+        if not path.exists():
+            print(f"Error: {path.name} not found at {path}")
+            exit(1)
+
+    counts = update_citation_counts(citations_path, bib_path, output_path)
+
+    if args.prune:
+        with open(citations_path, 'r', encoding='utf-8') as f:
+            citation_data = yaml.safe_load(f) or {}
+        args.archive.parent.mkdir(parents=True, exist_ok=True)
+        args.archive.write_bytes(citations_path.read_bytes())
+        papers = citation_data.get('papers') or {}
+        citation_data['papers'] = prune_papers(papers, counts, load_allowlist(args.allowlist))
+        with open(citations_path, 'w', encoding='utf-8') as f:
+            yaml.dump(citation_data, f, width=1000, sort_keys=True)
+        print(f"Kept {len(citation_data['papers'])} of {len(papers)} publications in {citations_path} "
+              f"(full file archived to {args.archive})")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Record/replay transport for the Google Scholar fetch in bin/update_scholar_citations.py
+
+The citation updater only needs one thing from Scholar: the filled author
+record (with its publications) for a user id. This module puts that call behind
+a small transport interface so it can be:
+
+- live:     fetched through scholarly, as before
+- recorded: fetched live and saved as a JSON fixture (<user id>.json)
+- replayed: loaded from a fixture, deterministically and without network
+- stubbed:  fetched over HTTP from scripts/stub_server.py serving the fixtures
+- cached:   fetched once per user id and shared, e.g. between the sites of a
+            batch run (scripts/batch_sites.py)
+
+Any transport can be wrapped with injected latency and failures, and
+fetch_author() retries failed fetches, so retry handling and throughput can be
+measured offline.
+
+Usage:
+    python scripts/scholar_transport.py record USER_ID [--fixtures DIR]
+    python scripts/scholar_transport.py serve [--fixtures DIR] [--port 8000] [--latency 0.2]
+    python scripts/scholar_transport.py bench [--fixtures DIR | --stub-url URL]
+        [--requests 200] [--workers 8] [--latency 0.05] [--failure-rate 0.1]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from instrumentation import count
+from stub_server import StubServer
+
+DEFAULT_FIXTURE_DIR = Path('.cache') / 'scholar' / 'fixtures'
+STUB_ROUTE = '/scholar/author/{user_id}'
+
+
+class TransportError(Exception):
+    """A fetch failed (network error, missing fixture or injected failure)."""
+
+
+def _to_json(value):
+    """scholarly records hold enums and sets; keep everything JSON-serializable."""
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_json(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class LiveTransport:
+    """Fetch through scholarly (the original behaviour)."""
+
+    def __init__(self, timeout: int = 15, retries: int = 3):
+        from scholarly import scholarly
+        self.scholarly = scholarly
+        scholarly.set_timeout(timeout)
+        scholarly.set_retries(retries)
+
+    def fetch_author(self, user_id: str) -> Dict:
+        author = self.scholarly.search_author_id(user_id)
+        return _to_json(self.scholarly.fill(author))
+
+
+class RecordingTransport:
+    """Fetch through another transport and save each result as a fixture."""
+
+    def __init__(self, inner, fixture_dir: Path):
+        self.inner = inner
+        self.fixture_dir = fixture_dir
+
+    def fetch_author(self, user_id: str) -> Dict:
+        author = self.inner.fetch_author(user_id)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        path = self.fixture_dir / f"{user_id}.json"
+        path.write_text(json.dumps(author, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"Recorded {len(author.get('publications', []))} publications to {path}")
+        return author
+
+
+class ReplayTransport:
+    """Serve fixtures recorded by RecordingTransport."""
+
+    def __init__(self, fixture_dir: Path):
+        self.fixture_dir = fixture_dir
+        self._cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def fetch_author(self, user_id: str) -> Dict:
+        with self._lock:
+            if user_id not in self._cache:
+                path = self.fixture_dir / f"{user_id}.json"
+                if not path.exists():
+                    raise TransportError(f"no fixture for {user_id} in {self.fixture_dir}")
+                self._cache[user_id] = path.read_text(encoding='utf-8')
+        # Decode per call so callers can't mutate each other's data
+        return json.loads(self._cache[user_id])
+
+
+class CachingTransport:
+    """
+    Fetch each user id once through another transport and share the result.
+
+    Concurrent callers asking for the same id wait for the one fetch in
+    flight; failed fetches are not cached.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self._cache: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def fetch_author(self, user_id: str) -> Dict:
+        with self._lock:
+            lock = self._locks.setdefault(user_id, threading.Lock())
+        with lock:
+            if user_id in self._cache:
+                count('scholar_cache_hits')
+            else:
+                self._cache[user_id] = json.dumps(self.inner.fetch_author(user_id))
+        # Decode per call so callers can't mutate each other's data
+        return json.loads(self._cache[user_id])
+
+
+class HttpTransport:
+    """Fetch fixtures over HTTP, e.g. from `scholar_transport.py serve`."""
+
+    def __init__(self, base_url: str, timeout: float = 15):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def fetch_author(self, user_id: str) -> Dict:
+        url = self.base_url + STUB_ROUTE.format(user_id=user_id)
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise TransportError(f"{url}: {e}") from e
+
+
+class FaultInjectingTransport:
+    """Add latency (fixed plus uniform jitter) and random failures to another transport."""
+
+    def __init__(self, inner, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.inner = inner
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch_author(self, user_id: str) -> Dict:
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            count('scholar_injected_failures')
+            raise TransportError(f"injected failure fetching {user_id}")
+        return self.inner.fetch_author(user_id)
+
+
+def fetch_author(transport, user_id: str, retries: int = 3, backoff: float = 1.0) -> Dict:
+    """Fetch with up to `retries` retries and exponential backoff."""
+    for attempt in range(retries + 1):
+        try:
+            author = transport.fetch_author(user_id)
+            count('scholar_fetches')
+            return author
+        except Exception:
+            if attempt == retries:
+                raise
+            count('scholar_retries')
+            time.sleep(backoff * (2 ** attempt))
+
+
+def make_transport(record: Optional[Path] = None, replay: Optional[Path] = None,
+                   stub_url: Optional[str] = None, latency: float = 0.0,
+                   failure_rate: float = 0.0, seed: Optional[int] = None):
+    """Build the transport selected by the update_scholar_citations.py options."""
+    if replay is not None:
+        transport = ReplayTransport(replay)
+    elif stub_url is not None:
+        transport = HttpTransport(stub_url)
+    else:
+        transport = LiveTransport()
+    if record is not None:
+        transport = RecordingTransport(transport, record)
+    if latency or failure_rate:
+        transport = FaultInjectingTransport(transport, latency=latency, failure_rate=failure_rate, seed=seed)
+    return transport
+
+
+def add_transport_arguments(parser: argparse.ArgumentParser):
+    """Add --record/--replay/--stub-url/--latency/--failure-rate/--seed to a script's options."""
+    group = parser.add_argument_group('offline testing')
+    group.add_argument('--record', type=Path, metavar='DIR', help='save fetched Scholar data as fixtures in DIR')
+    group.add_argument('--replay', type=Path, metavar='DIR', help='use fixtures from DIR instead of Scholar')
+    group.add_argument('--stub-url', metavar='URL', help='fetch fixtures from a `scholar_transport.py serve` server')
+    group.add_argument('--latency', type=float, default=0.0, help='add this many seconds to each fetch')
+    group.add_argument('--failure-rate', type=float, default=0.0, help='fail this fraction of fetches (0-1)')
+    group.add_argument('--seed', type=int, help='random seed for --failure-rate')
+
+
+def stub_routes(fixture_dir: Path, delay: float = 0.0) -> Dict[str, Dict]:
+    """stub_server routes serving every fixture in fixture_dir."""
+    return {
+        STUB_ROUTE.format(user_id=path.stem): {
+            'status': 200,
+            'body': path.read_text(encoding='utf-8'),
+            'headers': {'Content-Type': 'application/json'},
+            'delay': delay,
+        }
+        for path in sorted(fixture_dir.glob('*.json'))
+    }
+
+
+def benchmark(transport, user_ids: List[str], requests: int, workers: int,
+              retries: int, backoff: float) -> Dict:
+    """Fetch `requests` times across `workers` threads; returns throughput and latency stats."""
+    latencies: List[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            fetch_author(transport, user_ids[i % len(user_ids)], retries=retries, backoff=backoff)
+        except Exception:
+            with lock:
+                failures += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'succeeded': len(latencies),
+        'failed': failures,
+        'seconds': round(elapsed, 3),
+        'per_second': round(requests / elapsed, 1) if elapsed else None,
+        'median_ms': round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None,
+    }
+
+
+if __name__ == '__main__':
+    from instrumentation import counters
+
+    parser = argparse.ArgumentParser(description='Record, serve and replay Google Scholar author data.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    record = sub.add_parser('record', help='fetch live from Scholar and save a fixture')
+    record.add_argument('user_id')
+    record.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURE_DIR)
+
+    serve = sub.add_parser('serve', help='serve fixtures over HTTP with scripts/stub_server.py')
+    serve.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURE_DIR)
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--latency', type=float, default=0.0, help='server-side delay per response')
+
+    bench = sub.add_parser('bench', help='measure fetch throughput against fixtures')
+    bench.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURE_DIR)
+    bench.add_argument('--stub-url', help='fetch over HTTP from this server instead of reading fixtures')
+    bench.add_argument('--requests', type=int, default=200)
+    bench.add_argument('--workers', type=int, default=8)
+    bench.add_argument('--latency', type=float, default=0.05)
+    bench.add_argument('--jitter', type=float, default=0.0)
+    bench.add_argument('--failure-rate', type=float, default=0.0)
+    bench.add_argument('--retries', type=int, default=3)
+    bench.add_argument('--backoff', type=float, default=0.01)
+    bench.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        RecordingTransport(LiveTransport(), args.fixtures).fetch_author(args.user_id)
+        exit(0)
+
+    if not args.fixtures.exists() or not any(args.fixtures.glob('*.json')):
+        print(f"Error: no fixtures in {args.fixtures} (run `record` first)")
+        exit(1)
+
+    if args.command == 'serve':
+        routes = stub_routes(args.fixtures, delay=args.latency)
+        server = StubServer(routes, port=args.port)
+        print(f"Serving {len(routes)} fixtures at {server.url}{STUB_ROUTE} (Ctrl+C to stop)")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+    else:
+        inner = HttpTransport(args.stub_url) if args.stub_url else ReplayTransport(args.fixtures)
+        transport = FaultInjectingTransport(inner, latency=args.latency, jitter=args.jitter,
+                                            failure_rate=args.failure_rate, seed=args.seed)
+        user_ids = [path.stem for path in sorted(args.fixtures.glob('*.json'))]
+        result = benchmark(transport, user_ids, args.requests, args.workers, args.retries, args.backoff)
+        print(json.dumps(result, indent=2))
+        print(f"Retries: {counters().get('scholar_retries', 0)}, "
+              f"injected failures: {counters().get('scholar_injected_failures', 0)}")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stub server for exercising the maintenance scripts offline
+
+Serves canned responses from a routes file so that scripts which normally talk
+to external services (Crossref, link targets, ...) can be run and timed without
+network access.
+
+Routes file format (JSON):
+
+    {
+      "/works/10.1093/abm/kaaf094": {
+        "status": 200,
+        "body": {"message": {"volume": "59", "issue": "1", "page": "1-12"}},
+        "headers": {"Content-Type": "application/json"},
+        "delay": 0.05
+      }
+    }
+
+`body` may be a string or any JSON value (serialized automatically). Unknown
+paths return 404.
+
+Usage:
+    python scripts/stub_server.py routes.json [--port 8000]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def load_routes(routes_path: Path) -> Dict[str, Dict]:
+    """Load a routes file (see module docstring for the format)."""
+    with open(routes_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _make_handler(routes: Dict[str, Dict]):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _respond(self, send_body: bool):
+            route = routes.get(self.path)
+            if route is None:
+                # Allow routes to be declared without the query string
+                route = routes.get(self.path.split('?', 1)[0])
+
+            if route is None:
+                status, body, headers, delay = 404, b'', {}, 0
+            else:
+                status = route.get('status', 200)
+                body = route.get('body', '')
+                if not isinstance(body, str):
+                    body = json.dumps(body)
+                body = body.encode('utf-8')
+                headers = route.get('headers', {})
+                delay = route.get('delay', 0)
+
+            if delay:
+                time.sleep(delay)
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+class StubServer:
+    """
+    Threaded stub server usable as a context manager.
+
+        with StubServer(routes) as server:
+            fetch(server.url + '/works/...')
+    """
+
+    def __init__(self, routes: Dict[str, Dict], host: str = '127.0.0.1', port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(routes))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve canned HTTP responses from a routes file.')
+    parser.add_argument('routes', type=Path, help='JSON routes file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    server = StubServer(load_routes(args.routes), host=args.host, port=args.port)
+    print(f"Serving {args.routes} at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -6,16 +6,30 @@ This script:
 1. Parses papers.bib to extract all publications
 2. Reads members.yml to get member names
 3. Matches members to publications by author name
-4. Updates members.yml with matched publications (sorted by year, most recent first)
+4. Updates members.yml with matched publications (sorted by year, most recent first);
+   if the site keeps members as per-member shards in _members/, updates those
+   instead and rebuilds members.yml from them (see member_shards.py)
+5. Updates the per-member, per-year and per-category aggregates in
+   _data/publication_stats.yml (see publication_stats.py)
 
 Usage:
-    python scripts/update_member_publications.py
+    python scripts/update_member_publications.py [--profile PREFIX]
 """
 
+import argparse
 import re
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+from instrumentation import add_profile_argument, count, print_summary, profiling, span
+from latex_unicode import latex_to_unicode
+
+# Sections of members.yml whose members get a publications list
+MEMBER_CATEGORIES = ['graduate_students', 'undergraduate_students', 'alumni']
+# One BibTeX entry: type, key and body
+ENTRY_PATTERN = re.compile(r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}', re.DOTALL)
 
 
 def parse_bibtex_file(bib_path: Path) -> List[Dict]:
@@ -24,80 +38,96 @@ def parse_bibtex_file(bib_path: Path) -> List[Dict]:
 
     Returns list of dicts with: title, authors, journal, year, doi, html, entry_key
     """
-    publications = []
-
     with open(bib_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Match each BibTeX entry
-    entry_pattern = r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}'
-    entries = re.finditer(entry_pattern, content, re.DOTALL)
-
-    for entry in entries:
-        entry_type = entry.group(1)
-        entry_key = entry.group(2)
-        entry_content = entry.group(3)
-
-        # Extract fields
-        pub = {'entry_key': entry_key}
-
-        # Title
-        title_match = re.search(r'title\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
-        if title_match:
-            pub['title'] = title_match.group(1).replace('\n', ' ').strip()
-
-        # Authors
-        author_match = re.search(r'author\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
-        if author_match:
-            pub['authors'] = author_match.group(1).replace('\n', ' ').strip()
-
-        # Journal (or booktitle for conference papers)
-        journal_match = re.search(r'journal\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
-        if journal_match:
-            pub['journal'] = journal_match.group(1).replace('\n', ' ').strip()
-        else:
-            booktitle_match = re.search(r'booktitle\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
-            if booktitle_match:
-                pub['journal'] = booktitle_match.group(1).replace('\n', ' ').strip()
-
-        # Year
-        year_match = re.search(r'year\s*=\s*\{?(\d{4})\}?', entry_content)
-        if year_match:
-            pub['year'] = int(year_match.group(1))
-
-        # DOI
-        doi_match = re.search(r'doi\s*=\s*\{(.+?)\}', entry_content)
-        if doi_match:
-            pub['doi'] = doi_match.group(1).strip()
-
-        # HTML/URL
-        html_match = re.search(r'html\s*=\s*\{(.+?)\}', entry_content)
-        if html_match:
-            pub['html'] = html_match.group(1).strip()
-        else:
-            url_match = re.search(r'url\s*=\s*\{(.+?)\}', entry_content)
-            if url_match:
-                pub['html'] = url_match.group(1).strip()
+    return parse_bibtex_string(content)
 
-        # PDF
-        pdf_match = re.search(r'pdf\s*=\s*\{(.+?)\}', entry_content)
-        if pdf_match:
-            pub['pdf'] = pdf_match.group(1).strip()
 
-        # Replication
-        replication_match = re.search(r'replication\s*=\s*\{(.+?)\}', entry_content)
-        if replication_match:
-            pub['replication'] = replication_match.group(1).strip()
+def parse_bibtex_string(content: str, parse_entry: Callable[[str, str], Dict] = None) -> List[Dict]:
+    """
+    Parse the text of a BibTeX file (see parse_bibtex_file).
+
+    `parse_entry` replaces parse_bibtex_entry, e.g. with a cached version
+    shared between several bibliographies.
+    """
+    parse_entry = parse_entry or parse_bibtex_entry
+    publications = []
 
-        publications.append(pub)
+    # Match each BibTeX entry
+    for entry in ENTRY_PATTERN.finditer(content):
+        publications.append(parse_entry(entry.group(2), entry.group(3)))
 
+    count('entries_parsed', len(publications))
     return publications
 
 
-def normalize_name(name: str) -> Set[str]:
+def parse_bibtex_entry(entry_key: str, entry_content: str) -> Dict:
+    """
+    Extract publication information from the body of a single BibTeX entry
+    (everything between "@type{key," and the closing brace).
+    """
+    # Extract fields
+    pub = {'entry_key': entry_key}
+
+    # Title
+    title_match = re.search(r'title\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
+    if title_match:
+        pub['title'] = title_match.group(1).replace('\n', ' ').strip()
+
+    # Authors
+    author_match = re.search(r'author\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
+    if author_match:
+        pub['authors'] = author_match.group(1).replace('\n', ' ').strip()
+
+    # Journal (or booktitle for conference papers)
+    journal_match = re.search(r'journal\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
+    if journal_match:
+        pub['journal'] = journal_match.group(1).replace('\n', ' ').strip()
+    else:
+        booktitle_match = re.search(r'booktitle\s*=\s*\{(.+?)\}', entry_content, re.DOTALL)
+        if booktitle_match:
+            pub['journal'] = booktitle_match.group(1).replace('\n', ' ').strip()
+
+    # Year
+    year_match = re.search(r'year\s*=\s*\{?(\d{4})\}?', entry_content)
+    if year_match:
+        pub['year'] = int(year_match.group(1))
+
+    # DOI
+    doi_match = re.search(r'doi\s*=\s*\{(.+?)\}', entry_content)
+    if doi_match:
+        pub['doi'] = doi_match.group(1).strip()
+
+    # HTML/URL
+    html_match = re.search(r'html\s*=\s*\{(.+?)\}', entry_content)
+    if html_match:
+        pub['html'] = html_match.group(1).strip()
+    else:
+        url_match = re.search(r'url\s*=\s*\{(.+?)\}', entry_content)
+        if url_match:
+            pub['html'] = url_match.group(1).strip()
+
+    # PDF
+    pdf_match = re.search(r'pdf\s*=\s*\{(.+?)\}', entry_content)
+    if pdf_match:
+        pub['pdf'] = pdf_match.group(1).strip()
+
+    # Replication
+    replication_match = re.search(r'replication\s*=\s*\{(.+?)\}', entry_content)
+    if replication_match:
+        pub['replication'] = replication_match.group(1).strip()
+
+    return pub
+
+
+@lru_cache(maxsize=8192)
+def normalize_name(name: str) -> FrozenSet[str]:
     """
     Generate normalized name variants for matching.
 
+    Memoized, since every member is compared with every author of every paper.
+
     Returns set of possible name formats:
     - "firstname lastname"
     - "lastname, firstname"
@@ -158,7 +188,7 @@ def normalize_name(name: str) -> Set[str]:
                 variants.add(f"{lastname}, {firstname} {middle_initial}".lower())
                 variants.add(f"{lastname}, {firstname} {middle_initial}.".lower())
 
-    return variants
+    return frozenset(variants)
 
 
 def extract_author_names(author_string: str) -> List[str]:
@@ -178,6 +208,7 @@ def match_member_to_publications(member_name: str, publications: List[Dict]) ->
     """
     member_variants = normalize_name(member_name)
     matched_pubs = []
+    comparisons = 0
 
     for pub in publications:
         if 'authors' not in pub:
@@ -188,11 +219,14 @@ def match_member_to_publications(member_name: str, publications: List[Dict]) ->
 
         # Check if any author matches the member
         for author in pub_authors:
+            comparisons += 1
             author_variants = normalize_name(author)
             if member_variants & author_variants:  # Set intersection
                 matched_pubs.append(pub)
                 break  # Don't add the same pub multiple times
 
+    count('author_comparisons', comparisons)
+
     # Sort by year, most recent first
     matched_pubs.sort(key=lambda x: x.get('year', 0), reverse=True)
 
@@ -201,33 +235,12 @@ def match_member_to_publications(member_name: str, publications: List[Dict]) ->
 
 def clean_latex_escapes(text: str) -> str:
     r"""
-    Remove LaTeX escape sequences from text for HTML display.
-
-    Common LaTeX escapes:
-    - \& → &
-    - \% → %
-    - \$ → $
-    - \# → #
-    - \_ → _
-    - \{ → {
-    - \} → }
-    """
-    replacements = {
-        r'\&': '&',
-        r'\%': '%',
-        r'\$': '$',
-        r'\#': '#',
-        r'\_': '_',
-        r'\{': '{',
-        r'\}': '}',
-        r'\~': '~',
-        r'\^': '^',
-    }
-
-    for latex, html in replacements.items():
-        text = text.replace(latex, html)
+    Convert LaTeX markup in a BibTeX field to Unicode text for HTML display.
 
-    return text
+    Escapes (\& → &), accents ({\"u} → ü), dashes (-- → –), ties and grouping
+    braces ({COVID} → COVID) are all handled; see latex_unicode.py.
+    """
+    return latex_to_unicode(text)
 
 
 def format_publication_for_yaml(pub: Dict) -> Dict:
@@ -261,20 +274,27 @@ def format_publication_for_yaml(pub: Dict) -> Dict:
     return yaml_pub
 
 
-def update_members_file(members_path: Path, bib_path: Path):
+def update_members_file(members_path: Path, bib_path: Path,
+                        publications: List[Dict] = None, members_data: Dict = None):
     """
     Main function to update members.yml with matched publications.
+
+    Callers that already hold the parsed bibliography or members data (e.g. the
+    pipeline runner) can pass them in to skip re-reading the files.
     """
-    print(f"Reading bibliography from: {bib_path}")
-    publications = parse_bibtex_file(bib_path)
+    if publications is None:
+        print(f"Reading bibliography from: {bib_path}")
+        with span('parse'):
+            publications = parse_bibtex_file(bib_path)
     print(f"Found {len(publications)} publications in bibliography")
 
-    print(f"\nReading members from: {members_path}")
-    with open(members_path, 'r', encoding='utf-8') as f:
-        members_data = yaml.safe_load(f)
+    if members_data is None:
+        print(f"\nReading members from: {members_path}")
+        with open(members_path, 'r', encoding='utf-8') as f:
+            members_data = yaml.safe_load(f)
 
     # Process each member category
-    for category in ['graduate_students', 'undergraduate_students', 'alumni']:
+    for category in MEMBER_CATEGORIES:
         if category not in members_data:
             continue
 
@@ -283,13 +303,15 @@ def update_members_file(members_path: Path, bib_path: Path):
             member_name = member.get('name', '')
 
             # Match publications
-            matched_pubs = match_member_to_publications(member_name, publications)
+            with span('match'):
+                matched_pubs = match_member_to_publications(member_name, publications)
 
             # Format for YAML
             if matched_pubs:
-                member['publications'] = [
-                    format_publication_for_yaml(pub) for pub in matched_pubs
-                ]
+                with span('format'):
+                    member['publications'] = [
+                        format_publication_for_yaml(pub) for pub in matched_pubs
+                    ]
                 print(f"  {member_name}: {len(matched_pubs)} publications")
             else:
                 # Remove publications key if no matches
@@ -299,17 +321,36 @@ def update_members_file(members_path: Path, bib_path: Path):
 
     # Write updated members.yml
     print(f"\nWriting updated members to: {members_path}")
-    with open(members_path, 'w', encoding='utf-8') as f:
-        yaml.dump(members_data, f,
-                  default_flow_style=False,
-                  allow_unicode=True,
-                  sort_keys=False,
-                  width=120)
+    with span('dump'):
+        write_members_file(members_path, members_data)
 
     print("\n✓ Successfully updated members.yml with publications from papers.bib")
 
 
+def dump_members(members_data: Dict) -> str:
+    """
+    Serialize members data in the layout used for _data/members.yml.
+    """
+    return yaml.dump(members_data,
+                     default_flow_style=False,
+                     allow_unicode=True,
+                     sort_keys=False,
+                     width=120)
+
+
+def write_members_file(members_path: Path, members_data: Dict):
+    """
+    Write members data in the layout used for _data/members.yml.
+    """
+    with open(members_path, 'w', encoding='utf-8') as f:
+        f.write(dump_members(members_data))
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Match papers.bib publications to members in members.yml.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
     # Paths
     repo_root = Path(__file__).parent.parent
     members_path = repo_root / '_data' / 'members.yml'
@@ -324,5 +365,16 @@ if __name__ == '__main__':
         print(f"Error: papers.bib not found at {bib_path}")
         exit(1)
 
-    # Run update
-    update_members_file(members_path, bib_path)
+    # Run update (into the per-member shards if the site uses them)
+    shard_dir = repo_root / '_members'
+    with profiling(args.profile):
+        if shard_dir.exists():
+            from member_shards import update_member_shards
+            print(f"Updating member shards in {shard_dir}")
+            update_member_shards(shard_dir, members_path, bib_path)
+        else:
+            update_members_file(members_path, bib_path)
+        # Counts and author flags for the templates (see publication_stats.py)
+        from publication_stats import update_publication_stats
+        update_publication_stats(repo_root)
+    print_summary()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Keep members.yml in sync with papers.bib while you edit (e.g. during `jekyll serve`)
+
+This script:
+1. Parses papers.bib once and keeps the entries and an author-name index in memory
+2. Watches papers.bib and members.yml (inotify on Linux, polling elsewhere)
+3. On each save, re-parses only the entries whose text changed and re-matches
+   only the members whose names appear in those entries
+4. Rewrites members.yml only when a member's publication list actually changed
+5. Regenerates _data/publication_stats.yml (see publication_stats.py) after each
+   change, since the templates read corresponding authors from it by position
+
+If the site keeps its members as shards in _members/ (see member_shards.py),
+the shards are watched instead of members.yml, and changes go through
+member_shards.update_member_shards, which rewrites the changed shards and
+rebuilds members.yml from them.
+
+Usage:
+    python scripts/watch_member_publications.py [--poll] [--interval 0.5]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import re
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+from member_shards import ShardCache, read_shard, shard_paths, update_member_shards
+from publication_stats import load_owner, load_roster, publication_stats, write_publication_stats
+from update_member_publications import (
+    MEMBER_CATEGORIES,
+    extract_author_names,
+    format_publication_for_yaml,
+    normalize_name,
+    parse_bibtex_entry,
+    write_members_file,
+)
+
+ENTRY_PATTERN = re.compile(r'@(\w+)\{([^,]+),\s*\n(.*?)\n\}', re.DOTALL)
+
+
+class PublicationIndex:
+    """
+    Parsed bibliography plus an index from normalized author-name variant to
+    the entries containing that author. Updated incrementally from new file text.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Dict] = {}
+        self.order: List[str] = []
+        self.position: Dict[str, int] = {}
+        self._hashes: Dict[str, str] = {}
+        self._variants: Dict[str, Set[str]] = {}
+        self.name_index: Dict[str, Set[str]] = {}
+
+    def _unindex(self, uid: str):
+        for variant in self._variants.pop(uid, ()):
+            keys = self.name_index.get(variant)
+            if keys is not None:
+                keys.discard(uid)
+                if not keys:
+                    del self.name_index[variant]
+
+    def _index(self, uid: str, pub: Dict):
+        variants = set()
+        for author in extract_author_names(pub['authors']) if 'authors' in pub else ():
+            variants |= normalize_name(author)
+        self._variants[uid] = variants
+        for variant in variants:
+            self.name_index.setdefault(variant, set()).add(uid)
+
+    def update(self, content: str) -> Tuple[Optional[Set[str]], int]:
+        """
+        Bring the index in line with the new file text.
+
+        Returns (touched name variants, number of entries re-parsed). The touched
+        variants are None when entries were reordered, meaning every member must
+        be re-matched.
+        """
+        new_order = []
+        seen: Dict[str, int] = {}
+        raw: Dict[str, Tuple[str, str]] = {}
+        for entry in ENTRY_PATTERN.finditer(content):
+            key = entry.group(2)
+            # Keep duplicate keys apart, as parse_bibtex_file does
+            seen[key] = seen.get(key, 0) + 1
+            uid = key if seen[key] == 1 else f"{key}#{seen[key]}"
+            new_order.append(uid)
+            raw[uid] = (key, entry.group(3))
+
+        touched: Set[str] = set()
+        reparsed = 0
+        for uid in set(self.entries) - set(raw):
+            touched |= self._variants.get(uid, set())
+            self._unindex(uid)
+            del self.entries[uid]
+            del self._hashes[uid]
+
+        for uid, (key, entry_content) in raw.items():
+            digest = hashlib.sha1(entry_content.encode('utf-8')).hexdigest()
+            if self._hashes.get(uid) == digest:
+                continue
+            touched |= self._variants.get(uid, set())
+            self._unindex(uid)
+            pub = parse_bibtex_entry(key, entry_content)
+            self.entries[uid] = pub
+            self._hashes[uid] = digest
+            self._index(uid, pub)
+            touched |= self._variants[uid]
+            reparsed += 1
+
+        surviving_old = [uid for uid in self.order if uid in raw]
+        surviving_new = [uid for uid in new_order if uid in self.position]
+        reordered = surviving_old != surviving_new
+
+        self.order = new_order
+        self.position = {uid: i for i, uid in enumerate(new_order)}
+        return (None if reordered else touched), reparsed
+
+    def match(self, variants: Set[str]) -> List[Dict]:
+        """Same result as match_member_to_publications, via the name index."""
+        uids = set()
+        for variant in variants:
+            uids |= self.name_index.get(variant, set())
+        matched = [self.entries[uid] for uid in sorted(uids, key=self.position.__getitem__)]
+        matched.sort(key=lambda x: x.get('year', 0), reverse=True)
+        return matched
+
+
+class MemberPublicationsWatcher:
+    """
+    Applies bibliography/member changes to the in-memory members data and writes
+    members.yml, or, with a shard_dir, updates the member shards.
+    """
+
+    def __init__(self, bib_path: Path, members_path: Path, shard_dir: Optional[Path] = None):
+        self.bib_path = bib_path
+        self.members_path = members_path
+        self.shard_dir = shard_dir
+        self.stats_path = members_path.parent / 'publication_stats.yml'
+        self.shard_cache = ShardCache()
+        self.index = PublicationIndex()
+        self.members_data: Dict = {}
+        self._member_variants: Dict[str, Set[str]] = {}
+        self._last_written: Optional[bytes] = None
+
+    def _members(self) -> Iterable[Dict]:
+        for category in MEMBER_CATEGORIES:
+            for member in self.members_data.get(category) or []:
+                yield member
+
+    def _variants(self, name: str) -> Set[str]:
+        if name not in self._member_variants:
+            self._member_variants[name] = normalize_name(name)
+        return self._member_variants[name]
+
+    def _rematch(self, member: Dict) -> bool:
+        """Recompute one member's publications; return True if they changed."""
+        matched = self.index.match(self._variants(member.get('name', '')))
+        publications = [format_publication_for_yaml(pub) for pub in matched]
+        if publications == member.get('publications', []):
+            return False
+        if publications:
+            member['publications'] = publications
+        else:
+            member.pop('publications', None)
+        return True
+
+    def _write(self):
+        write_members_file(self.members_path, self.members_data)
+        self._last_written = self.members_path.read_bytes()
+
+    def load_members(self) -> bool:
+        """(Re)load members.yml unless it is the file we just wrote."""
+        content = self.members_path.read_bytes()
+        if content == self._last_written:
+            return False
+        self.members_data = yaml.safe_load(content) or {}
+        return True
+
+    def sync_all(self) -> List[str]:
+        changed = [member.get('name', '') for member in self._members() if self._rematch(member)]
+        if changed:
+            self._write()
+        return changed
+
+    def on_bib_changed(self) -> Tuple[List[str], int]:
+        touched, reparsed = self.index.update(self.bib_path.read_text(encoding='utf-8'))
+        if touched is None:
+            return self.sync_all(), reparsed
+
+        changed = []
+        for member in self._members():
+            if self._variants(member.get('name', '')) & touched and self._rematch(member):
+                changed.append(member.get('name', ''))
+        if changed:
+            self._write()
+        return changed, reparsed
+
+    def update_stats(self) -> bool:
+        """Rewrite publication_stats.yml from papers.bib and the members; return True if it changed."""
+        if self.shard_dir is not None:
+            # members.yml was just rebuilt from the shards
+            with open(self.members_path, 'r', encoding='utf-8') as f:
+                members_data = yaml.safe_load(f)
+        else:
+            members_data = self.members_data
+        roster = load_roster(members_data, load_owner(self.bib_path.parent.parent / '_config.yml'))
+        stats = publication_stats(self.bib_path.read_text(encoding='utf-8'), roster)
+        return write_publication_stats(stats, self.stats_path)
+
+    def watched_paths(self) -> List[Path]:
+        if self.shard_dir is not None:
+            return [self.bib_path] + shard_paths(self.shard_dir)
+        return [self.bib_path, self.members_path]
+
+    def _update_shards(self, names: Optional[Iterable[str]]) -> List[str]:
+        """Re-match the shards of `names` (None: every shard); return the members whose shard changed."""
+        if names is not None and not names:
+            return []
+        publications = [self.index.entries[uid] for uid in self.index.order]
+        written = update_member_shards(self.shard_dir, self.members_path, self.bib_path,
+                                       publications=publications, names=names, cache=self.shard_cache)
+        return [self.shard_cache.entries[str(path)][1].get('name', path.stem) for path in written]
+
+    def handle_shards(self, changed_paths: Set[Path]) -> Tuple[List[str], List[str]]:
+        """Shard mode of handle(): returns (messages, updated members)."""
+        messages = []
+        names: Optional[Set[str]] = set()
+        if self.bib_path in changed_paths:
+            touched, reparsed = self.index.update(self.bib_path.read_text(encoding='utf-8'))
+            messages.append(f"papers.bib changed, re-parsed {reparsed} entries")
+            if touched is None:
+                names = None
+            else:
+                shards = self.shard_cache.load(shard_paths(self.shard_dir))
+                names = {member.get('name', '') for member in shards.values()
+                         if self._variants(member.get('name', '')) & touched}
+        edited = [path for path in changed_paths if path != self.bib_path and path.exists()]
+        if edited:
+            messages.append(f"{len(edited)} shard(s) changed")
+            if names is not None:
+                names |= {read_shard(path).get('name', '') for path in edited}
+        return messages, self._update_shards(names)
+
+    def start(self):
+        self.index.update(self.bib_path.read_text(encoding='utf-8'))
+        if self.shard_dir is not None:
+            changed = self._update_shards(None)
+            summary = f"{len(shard_paths(self.shard_dir))} member shards ({len(changed)} updated)"
+        else:
+            self.load_members()
+            changed = self.sync_all()
+            summary = f"{sum(1 for _ in self._members())} members ({len(changed)} updated)"
+        stats = 'updated' if self.update_stats() else 'unchanged'
+        print(f"Indexed {len(self.index.entries)} entries, {summary}, publication stats {stats}")
+
+    def handle(self, changed_paths: Set[Path]):
+        start = time.perf_counter()
+        members_changed: List[str] = []
+        messages = []
+        if self.shard_dir is not None:
+            messages, members_changed = self.handle_shards(changed_paths)
+        elif self.bib_path in changed_paths:
+            members_changed, reparsed = self.on_bib_changed()
+            messages.append(f"papers.bib changed, re-parsed {reparsed} entries")
+        if self.shard_dir is None and self.members_path in changed_paths and self.load_members():
+            self._member_variants.clear()
+            members_changed = self.sync_all()
+            messages.append("members.yml changed, re-matched all members")
+        if not messages:
+            return
+        # Author order can change without any member's list changing, so always recompute
+        if self.update_stats():
+            messages.append("publication_stats.yml updated")
+        elapsed = (time.perf_counter() - start) * 1000
+        names = ', '.join(members_changed) if members_changed else 'none'
+        print(f"{'; '.join(messages)}; updated members: {names} ({elapsed:.1f} ms)")
+
+
+# ---------------------------------------------------------------------------
+# File watching
+# ---------------------------------------------------------------------------
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _inotify_library():
+    if not sys.platform.startswith('linux'):
+        return None
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    return libc
+
+
+def watch_inotify(paths: List[Path], callback: Callable[[Set[Path]], None], debounce: float = 0.05) -> bool:
+    """
+    Watch the directories containing `paths` with inotify and call back with the
+    set of changed paths. Returns False if inotify is unavailable.
+    """
+    libc = _inotify_library()
+    if libc is None:
+        return False
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return False
+
+    # Watch directories, not files: editors often save by writing a new file and renaming it
+    watched: Dict[int, Path] = {}
+    for directory in {path.parent for path in paths}:
+        wd = libc.inotify_add_watch(fd, str(directory).encode(),
+                                    IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY)
+        if wd < 0:
+            os.close(fd)
+            return False
+        watched[wd] = directory
+
+    wanted = set(paths)
+    print(f"Watching {', '.join(path.name for path in paths)} (inotify)")
+    try:
+        while True:
+            select.select([fd], [], [])
+            changed: Set[Path] = set()
+            # Collect the burst of events a single save produces
+            deadline = time.monotonic() + debounce
+            while True:
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    data = b''
+                offset = 0
+                while offset < len(data):
+                    wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                    name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+                    offset += _EVENT_HEADER.size + length
+                    path = watched.get(wd, Path()) / name.rstrip(b'\0').decode()
+                    if path in wanted:
+                        changed.add(path)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    break
+            if changed:
+                callback(changed)
+    finally:
+        os.close(fd)
+
+
+def watch_polling(paths: List[Path], callback: Callable[[Set[Path]], None], interval: float = 0.5):
+    """Portable fallback: compare size and mtime every `interval` seconds."""
+    def signature(path: Path):
+        try:
+            stat = path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    last = {path: signature(path) for path in paths}
+    while True:
+        time.sleep(interval)
+        changed = set()
+        for path in paths:
+            current = signature(path)
+            if current != last[path]:
+                last[path] = current
+                if current is not None:
+                    changed.add(path)
+        if changed:
+            callback(changed)
+
+
+if __name__ == '__main__':
+    repo_root = Path(__file__).resolve().parent.parent
+
+    parser = argparse.ArgumentParser(description='Regenerate member publications whenever papers.bib or members.yml changes.')
+    parser.add_argument('--poll', action='store_true', help='use polling instead of inotify')
+    parser.add_argument('--interval', type=float, default=0.5, help='polling interval in seconds (default: %(default)s)')
+    args = parser.parse_args()
+
+    bib_path = repo_root / '_bibliography' / 'papers.bib'
+    members_path = repo_root / '_data' / 'members.yml'
+    shard_dir = repo_root / '_members'
+    for path in (bib_path, members_path):
+        if not path.exists():
+            print(f"Error: {path.name} not found at {path}")
+            exit(1)
+
+    # With member shards, members.yml is generated from them: watch the shards instead
+    watcher = MemberPublicationsWatcher(bib_path, members_path, shard_dir if shard_dir.exists() else None)
+    watcher.start()
+
+    paths = watcher.watched_paths()
+    try:
+        if args.poll or not watch_inotify(paths, watcher.handle):
+            print(f"Watching {', '.join(path.name for path in paths)} (polling every {args.interval}s)")
+            watch_polling(paths, watcher.handle, args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")